@@ -95,16 +95,58 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 PARQUET_DIR = os.path.join(DATA_DIR, 'parquet')
 
-# Archivos Parquet específicos por país/región
+# Dataset particionado pais=/indicador=/anio= generado por convert_to_parquet.py
+# a partir de data/sources.json
+PARQUET_DATASET_DIR = os.path.join(PARQUET_DIR, 'dataset')
+
+# Archivos Parquet específicos por país/región. Cada entrada puede ser un
+# archivo o PARQUET_DATASET_DIR (el loader lee solo la partición de la serie)
 PARQUET_FILES = {
     'chile': {
-        'ipc': os.path.join(PARQUET_DIR, 'chile', 'ipc_data.parquet'),
+        'ipc': PARQUET_DATASET_DIR,
     }
 }
 
 # Compatibilidad con código existente
 PARQUET_FILE_PATH = PARQUET_FILES['chile']['ipc']
 
+# Exports completos pre-generados por versión de los datos (ver ipc/artifacts.py)
+EXPORT_ARTIFACTS_DIR = os.path.join(DATA_DIR, 'exports')
+IPC_BUILD_EXPORT_ARTIFACTS = True
+
+# Origen de las lecturas del dashboard y de las APIs de gráfico, resumen,
+# indicadores y consulta: 'db' (tabla IPCData) o 'parquet' (directo desde
+# PARQUET_FILES con memory map, sin conexión a la base de datos; la
+# versión de los datos sale del mtime de los archivos). La carga y las
+# exportaciones siguen usando la base de datos.
+IPC_READ_BACKEND = os.environ.get('IPC_READ_BACKEND', 'db')
+
+# Filas por lote en la carga masiva (bulk_create / bulk_update)
+IPC_LOADER_BATCH_SIZE = 500
+
+# Filas leídas del Parquet por iteración (memoria acotada en la carga)
+IPC_LOADER_CHUNK_SIZE = 5000
+
+# Logging: el logger ipc solo muestra avisos y errores por consola. Los
+# comandos de carga lo suben a IPC_LOG_LEVEL para mostrar el avance
+IPC_LOG_LEVEL = os.environ.get('IPC_LOG_LEVEL', 'INFO')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'ipc': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
 # Configuración de caché
 CACHES = {
     'default': {
@@ -117,6 +159,21 @@ CACHES = {
     }
 }
 
+# Caché de la API IPC: las claves incluyen la versión de los datos, así que
+# una carga nueva invalida todas las respuestas sin esperar el TTL
+IPC_CACHE_TIMEOUT = 300
+
+# Respuestas vencidas: se siguen sirviendo hasta este tiempo extra mientras
+# una sola request las recalcula en segundo plano (ver ipc/cached.py), y el
+# lock de recálculo se libera solo después de IPC_CACHE_LOCK_TIMEOUT
+IPC_CACHE_STALE_TIMEOUT = 600
+IPC_CACHE_LOCK_TIMEOUT = 10
+
+# Cuánto se guarda la versión de los datos en caché. Con LocMemCache cada
+# proceso tiene su copia, así que este valor acota cuánto tarda un worker en
+# ver una carga hecha desde otro proceso.
+IPC_DATA_VERSION_TIMEOUT = 30
+
 # Configuración de caché específica para producción
 if 'RENDER' in os.environ:
     # En producción, usar Redis si está disponible
@@ -127,6 +184,9 @@ if 'RENDER' in os.environ:
             'LOCATION': REDIS_URL,
             'TIMEOUT': 300,
         }
+        # Redis es compartido: la nueva versión se ve de inmediato en todos
+        # los workers, así que las respuestas pueden vivir horas
+        IPC_CACHE_TIMEOUT = 60 * 60 * 6
 
 # Configuración específica para Render
 if 'RENDER' in os.environ:
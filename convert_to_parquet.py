@@ -1,107 +1,317 @@
 """
-Script para convertir el Excel IPC a formato Parquet optimizado
-Ejecutar UNA SOLA VEZ para crear el archivo optimizado
+Construye el dataset Parquet particionado a partir de las fuentes del
+manifiesto (data/sources.json)
+
+Cada fuente (Excel o CSV) se convierte a data/parquet/dataset/
+pais=<pais>/indicador=<indicador>/anio=<año>/ con las filas ordenadas por
+fecha. Las fuentes se procesan en paralelo (un proceso por fuente) y solo
+se reconstruyen las que cambiaron desde la última ejecución.
+
+Uso:
+    python convert_to_parquet.py
+    python convert_to_parquet.py --force --workers 4
+    python convert_to_parquet.py --only chile/ipc
 """
 
-import pandas as pd
+import argparse
+import hashlib
+import json
 import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 
-def convert_excel_to_parquet():
-    # Rutas de archivos - usar rutas relativas para portabilidad
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    excel_path = os.path.join(base_dir, "Bases de Datos", "IPC_Anual_Mensual.xlsx")
-
-    # Nueva estructura organizada
-    parquet_dir = os.path.join(base_dir, "data", "parquet", "chile")
-    os.makedirs(parquet_dir, exist_ok=True)
-    parquet_path = os.path.join(parquet_dir, "ipc_data.parquet")
-    
-    print("🔄 Convirtiendo Excel a Parquet...")
-    
-    try:
-        # Leer Excel actual
-        print("📁 Leyendo archivo Excel...")
-        df = pd.read_excel(excel_path, sheet_name='Cuadro')
-        
-        print(f"📊 Registros encontrados: {len(df)}")
-        print(f"📋 Columnas: {df.columns.tolist()}")
-        
-        # Limpiar nombres de columnas
-        df.columns = df.columns.str.strip()
-        
-        # Optimizar tipos de datos para máximo rendimiento
-        print("⚡ Optimizando tipos de datos...")
-        
-        # Convertir periodo a string optimizado
-        df['Periodo'] = df['Periodo'].astype('string')
-        
-        # Optimizar números (float32 en vez de float64 = 50% menos memoria)
-        df['1. Variación Mensual'] = pd.to_numeric(df['1. Variación Mensual'], errors='coerce').astype('float32')
-        df['2. Variación Anual'] = pd.to_numeric(df['2. Variación Anual'], errors='coerce').astype('float32')
-        
-        # Limpiar datos nulos
-        df = df.dropna(subset=['Periodo'])
-        
-        print(f"📊 Registros válidos después de limpiar: {len(df)}")
-        
-        # Guardar en Parquet con compresión máxima
-        print("💾 Guardando archivo Parquet optimizado...")
-        df.to_parquet(parquet_path, 
-                     compression='snappy',  # Compresión rápida y eficiente
-                     index=False)
-        
-        # Verificar tamaños de archivo
-        excel_size = os.path.getsize(excel_path) / 1024  # KB
-        parquet_size = os.path.getsize(parquet_path) / 1024  # KB
-        
-        print("✅ Conversión completada!")
-        print(f"📦 Tamaño Excel: {excel_size:.1f} KB")
-        print(f"📦 Tamaño Parquet: {parquet_size:.1f} KB")
-        print(f"🚀 Reducción de tamaño: {((excel_size - parquet_size) / excel_size * 100):.1f}%")
-        
-        # Test de velocidad básico
-        import time
-        
-        print("\n⏱️  Test de velocidad:")
-        
-        # Excel
-        start = time.time()
-        df_excel = pd.read_excel(excel_path, sheet_name='Cuadro')
-        excel_time = (time.time() - start) * 1000
-        
-        # Parquet
-        start = time.time()
-        df_parquet = pd.read_parquet(parquet_path)
-        parquet_time = (time.time() - start) * 1000
-        
-        print(f"📈 Excel: {excel_time:.1f}ms")
-        print(f"⚡ Parquet: {parquet_time:.1f}ms")
-        print(f"🏆 Mejora de velocidad: {(excel_time / parquet_time):.1f}x más rápido")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
-
-if __name__ == "__main__":
-    print("🚀 Optimizador de archivos IPC")
-    print("=" * 50)
-    
-    # Verificar que pandas esté instalado
-    try:
-        import pyarrow
-        print("✅ PyArrow encontrado")
-    except ImportError:
-        print("⚠️  Instalando PyArrow...")
-        os.system("pip install pyarrow")
-    
-    success = convert_excel_to_parquet()
-    
-    if success:
-        print("\n🎉 ¡Optimización completada!")
-        print("📝 Próximo paso: Actualizar data_loader.py para usar Parquet")
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from ipc.dataset import PARQUET_COMPRESSION, partition_dir
+from ipc.parsing import parse_periodo_column, parse_decimal_column
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(BASE_DIR, 'data', 'sources.json')
+DEFAULT_OUTPUT = os.path.join(BASE_DIR, 'data', 'parquet', 'dataset')
+
+# Estado de la última construcción (pyarrow ignora archivos que empiezan con '_')
+STATE_FILE = '_fuentes.json'
+
+# Filas por row group dentro de cada archivo anual
+ROW_GROUP_SIZE = 10000
+
+
+def source_key(fuente):
+    return f"{fuente['pais']}/{fuente['indicador']}"
+
+
+def file_hash(ruta):
+    """
+    SHA-256 del archivo, leído en bloques
+    """
+    digest = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def config_hash(fuente):
+    """
+    Huella de la configuración de la fuente: si cambia (otra hoja, otras
+    columnas) se reconstruye aunque el archivo sea el mismo
+    """
+    return hashlib.sha256(json.dumps(fuente, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def read_source(ruta, fuente):
+    """
+    Lee una fuente Excel o CSV con solo las columnas del manifiesto
+    """
+    columnas = list(fuente['columnas'])
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension in ('.xlsx', '.xls'):
+        df = pd.read_excel(ruta, sheet_name=fuente.get('hoja', 0))
+    elif extension == '.csv':
+        df = pd.read_csv(ruta, sep=fuente.get('separador', ','), encoding=fuente.get('encoding', 'utf-8'))
     else:
-        print("\n❌ Error en la conversión")
-    
-    input("\nPresiona Enter para continuar...")
\ No newline at end of file
+        raise ValueError(f"Formato no soportado: {extension}")
+
+    # Limpiar nombres de columnas
+    df.columns = df.columns.str.strip()
+
+    faltantes = [col for col in columnas if col not in df.columns]
+    if faltantes:
+        raise ValueError(f"No se encontraron estas columnas: {faltantes} (disponibles: {df.columns.tolist()})")
+
+    return df[columnas].rename(columns=fuente['columnas'])
+
+
+def to_table(df):
+    """
+    Tabla Arrow normalizada: periodo, fecha, valores (float64) y anio,
+    ordenada por fecha y sin filas inválidas ni períodos repetidos
+    """
+    periodos, fechas, invalidos = parse_periodo_column(df['periodo'])
+
+    columnas = {'periodo': periodos, 'fecha': fechas}
+    for nombre in df.columns:
+        if nombre != 'periodo':
+            columnas[nombre] = parse_decimal_column(df[nombre])
+
+    normalizado = pd.DataFrame(columnas)[~invalidos]
+    normalizado = normalizado.drop_duplicates(subset='periodo', keep='last').sort_values('fecha')
+    normalizado['anio'] = normalizado['fecha'].dt.year.astype('int16')
+    normalizado['fecha'] = normalizado['fecha'].dt.date
+
+    schema = pa.schema(
+        [('periodo', pa.string()), ('fecha', pa.date32())]
+        + [(nombre, pa.float64()) for nombre in normalizado.columns if nombre not in ('periodo', 'fecha', 'anio')]
+        + [('anio', pa.int16())]
+    )
+    return pa.Table.from_pandas(normalizado, schema=schema, preserve_index=False), int(invalidos.sum())
+
+
+def build_source(fuente, base_dir, output):
+    """
+    Convierte una fuente a un directorio temporal dentro de output
+
+    Corre en un proceso de trabajo; el proceso principal publica el
+    resultado con publish_source.
+
+    Returns:
+        dict: Resumen (clave, temporal, filas, descartadas, años, segundos)
+    """
+    inicio = time.perf_counter()
+    ruta = os.path.join(base_dir, fuente['archivo'])
+
+    tabla, descartadas = to_table(read_source(ruta, fuente))
+
+    temporal = os.path.join(output, f".tmp-{fuente['pais']}-{fuente['indicador']}-{os.getpid()}")
+    shutil.rmtree(temporal, ignore_errors=True)
+
+    formato = ds.ParquetFileFormat()
+    ds.write_dataset(
+        tabla,
+        temporal,
+        format=formato,
+        partitioning=ds.partitioning(pa.schema([('anio', pa.int16())]), flavor='hive'),
+        file_options=formato.make_write_options(compression=PARQUET_COMPRESSION),
+        basename_template='part-{i}.parquet',
+        max_rows_per_group=ROW_GROUP_SIZE,
+        # Un hilo: conserva el orden por fecha dentro de cada año
+        use_threads=False,
+    )
+
+    return {
+        'clave': source_key(fuente),
+        'temporal': temporal,
+        'filas': tabla.num_rows,
+        'descartadas': descartadas,
+        'anios': len(set(tabla.column('anio').to_pylist())),
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+def publish_source(fuente, temporal, output):
+    """
+    Reemplaza el directorio de la serie por el recién construido
+    """
+    destino = partition_dir(output, fuente['pais'], fuente['indicador'])
+    anterior = destino + '.old'
+
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    shutil.rmtree(anterior, ignore_errors=True)
+
+    if os.path.exists(destino):
+        os.rename(destino, anterior)
+    os.rename(temporal, destino)
+    shutil.rmtree(anterior, ignore_errors=True)
+
+
+def load_state(output):
+    ruta = os.path.join(output, STATE_FILE)
+    if not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(output, estado):
+    ruta = os.path.join(output, STATE_FILE)
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(estado, f, indent=2, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def source_changed(fuente, ruta, previo, output):
+    """
+    Compara la fuente con el estado guardado: configuración, luego mtime
+    y tamaño y, si difieren, el hash del contenido
+
+    Returns:
+        tuple: (cambió, firma actual)
+    """
+    stat = os.stat(ruta)
+    firma = {'mtime': stat.st_mtime, 'tamano': stat.st_size, 'config': config_hash(fuente)}
+
+    if not previo or previo.get('config') != firma['config']:
+        return True, firma
+    if not os.path.isdir(partition_dir(output, fuente['pais'], fuente['indicador'])):
+        return True, firma
+
+    if previo.get('mtime') == firma['mtime'] and previo.get('tamano') == firma['tamano']:
+        firma['hash'] = previo.get('hash')
+        return False, firma
+
+    firma['hash'] = file_hash(ruta)
+    return firma['hash'] != previo.get('hash'), firma
+
+
+def build_dataset(manifest=DEFAULT_MANIFEST, output=DEFAULT_OUTPUT, workers=None, force=False, only=None, base_dir=BASE_DIR):
+    """
+    Construye (o actualiza) el dataset para todas las fuentes del manifiesto
+
+    Las rutas 'archivo' del manifiesto son relativas a base_dir (la raíz
+    del proyecto).
+
+    Returns:
+        dict: Resultado por fuente ('construida', 'sin cambios' o el error)
+    """
+    with open(manifest, encoding='utf-8') as f:
+        fuentes = json.load(f)['sources']
+
+    if only:
+        fuentes = [fuente for fuente in fuentes if source_key(fuente) in only]
+
+    os.makedirs(output, exist_ok=True)
+    estado = load_state(output)
+    resultados = {}
+
+    pendientes = []
+    for fuente in fuentes:
+        clave = source_key(fuente)
+        ruta = os.path.join(base_dir, fuente['archivo'])
+
+        try:
+            cambio, firma = source_changed(fuente, ruta, estado.get(clave), output)
+        except OSError as e:
+            print(f"❌ {clave}: {e}")
+            resultados[clave] = f"error: {e}"
+            continue
+
+        if cambio or force:
+            pendientes.append((fuente, ruta, firma))
+        else:
+            print(f"⏭️  {clave}: sin cambios")
+            resultados[clave] = 'sin cambios'
+            # Mismo contenido con otra fecha de modificación: no volver a leerlo
+            estado[clave] = {**estado[clave], **firma}
+
+    save_state(output, estado)
+    if not pendientes:
+        return resultados
+
+    print(f"🔄 Construyendo {len(pendientes)} fuente(s) con {workers or os.cpu_count()} proceso(s)...")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = {
+            executor.submit(build_source, fuente, base_dir, output): (fuente, ruta, firma)
+            for fuente, ruta, firma in pendientes
+        }
+
+        for futuro in as_completed(futuros):
+            fuente, ruta, firma = futuros[futuro]
+            clave = source_key(fuente)
+
+            try:
+                resumen = futuro.result()
+            except Exception as e:
+                print(f"❌ {clave}: {e}")
+                resultados[clave] = f"error: {e}"
+                continue
+
+            publish_source(fuente, resumen['temporal'], output)
+
+            estado[clave] = {
+                **firma,
+                'hash': firma.get('hash') or file_hash(ruta),
+                'archivo': fuente['archivo'],
+                'filas': resumen['filas'],
+                'construido': datetime.now().isoformat(timespec='seconds'),
+            }
+            save_state(output, estado)
+
+            print(
+                f"✅ {clave}: {resumen['filas']} filas en {resumen['anios']} año(s), "
+                f"{resumen['descartadas']} descartadas ({resumen['segundos'] * 1000:.0f}ms)"
+            )
+            resultados[clave] = 'construida'
+
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Construye el dataset Parquet particionado desde el manifiesto de fuentes')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Manifiesto JSON de fuentes')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Directorio raíz del dataset')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos en paralelo (por defecto, uno por CPU)')
+    parser.add_argument('--force', action='store_true', help='Reconstruir todas las fuentes aunque no hayan cambiado')
+    parser.add_argument('--only', nargs='+', metavar='PAIS/INDICADOR', help='Construir solo estas fuentes')
+    args = parser.parse_args(argv)
+
+    print("🚀 Dataset Parquet")
+    print("=" * 50)
+
+    inicio = time.perf_counter()
+    resultados = build_dataset(args.manifest, args.output, args.workers, args.force, args.only)
+    errores = [clave for clave, resultado in resultados.items() if resultado.startswith('error')]
+
+    print(f"\n🎉 {len(resultados) - len(errores)} fuente(s) OK, {len(errores)} con error ({time.perf_counter() - inicio:.1f}s)")
+    return 1 if errores else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import IPCData
+from .models import IPCData, FuenteDatos, Serie
 
 @admin.register(IPCData)
 class IPCDataAdmin(admin.ModelAdmin):
@@ -29,6 +29,17 @@ class IPCDataAdmin(admin.ModelAdmin):
             return self.readonly_fields + ['periodo', 'fecha']
         return self.readonly_fields
 
+@admin.register(FuenteDatos)
+class FuenteDatosAdmin(admin.ModelAdmin):
+    list_display = ['pais', 'tipo_dato', 'ultima_fecha', 'filas', 'cargado_en']
+    readonly_fields = ['ruta', 'mtime', 'tamano', 'hash_contenido', 'ultima_fecha', 'filas', 'cargado_en']
+
+@admin.register(Serie)
+class SerieAdmin(admin.ModelAdmin):
+    list_display = ['codigo', 'pais', 'indicador', 'frecuencia', 'unidad']
+    list_filter = ['pais', 'frecuencia']
+    search_fields = ['codigo', 'nombre']
+
 # Personalizar el sitio admin
 admin.site.site_header = "Panel de Control - Analytics Platform"
 admin.site.site_title = "Analytics Platform"
@@ -0,0 +1,143 @@
+"""
+Archivos de exportación pre-generados por versión de los datos
+
+Los exports completos (sin filtros) solo cambian cuando corre el loader,
+así que se generan una vez por versión en EXPORT_ARTIFACTS_DIR y las
+descargas pasan a ser envíos de archivo. Solo la carga los genera
+(schedule_rebuild); las requests solo los abren.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from django.conf import settings
+from django.db import connection
+from .caching import get_data_version
+from .exports import write_ipc_workbook, write_parquet, stream_csv, stream_arrow
+from .models import IPCData
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMATS = ['xlsx', 'csv', 'parquet', 'arrow']
+
+_EXTENSIONS = {
+    'xlsx': 'xlsx',
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'arrow': 'arrows',
+}
+
+
+def _write_stream(destino, chunks):
+    for chunk in chunks:
+        destino.write(chunk)
+
+
+_WRITERS = {
+    'xlsx': lambda destino: write_ipc_workbook(destino, IPCData.objects.all()),
+    'parquet': lambda destino: write_parquet(destino, IPCData.objects.all()),
+    'csv': lambda destino: _write_stream(destino, stream_csv(IPCData.objects.all())),
+    'arrow': lambda destino: _write_stream(destino, stream_arrow(IPCData.objects.all())),
+}
+
+
+def _version_dir(version, clave='chile.ipc'):
+    return os.path.join(settings.EXPORT_ARTIFACTS_DIR, clave, f'v{version}')
+
+
+def artifact_path(formato, version, clave='chile.ipc'):
+    """
+    Ruta del archivo pre-generado para un formato y versión
+    """
+    return os.path.join(_version_dir(version, clave), f'datos_ipc.{_EXTENSIONS[formato]}')
+
+
+def build_artifact(formato, version, clave='chile.ipc'):
+    """
+    Genera un archivo y lo publica con os.replace (atómico): quien lo lea
+    nunca ve un archivo a medio escribir
+
+    Returns:
+        str: Ruta del archivo generado
+    """
+    destino = artifact_path(formato, version, clave)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            _WRITERS[formato](f)
+        os.replace(temporal, destino)
+    except Exception:
+        os.unlink(temporal)
+        raise
+
+    return destino
+
+
+def build_artifacts(formatos=None, clave='chile.ipc'):
+    """
+    Genera todos los exports de la versión actual y borra los de versiones
+    anteriores
+    """
+    version = get_data_version(clave)
+    if not version:
+        return
+
+    for formato in formatos or ARTIFACT_FORMATS:
+        try:
+            build_artifact(formato, version, clave)
+        except Exception:
+            logger.exception(f"❌ Error generando export {formato} v{version}")
+
+    _remove_old_versions(version, clave)
+    logger.info(f"📦 Exports v{version} generados en {_version_dir(version, clave)}")
+
+
+def _remove_old_versions(version, clave='chile.ipc'):
+    base = os.path.join(settings.EXPORT_ARTIFACTS_DIR, clave)
+    actual = f'v{version}'
+
+    for nombre in os.listdir(base):
+        ruta = os.path.join(base, nombre)
+        if nombre != actual and nombre.startswith('v') and os.path.isdir(ruta):
+            shutil.rmtree(ruta, ignore_errors=True)
+
+
+def open_artifact(formato, clave='chile.ipc'):
+    """
+    Export de la versión actual abierto para lectura, o None si los datos
+    aún no tienen versión o el archivo no existe (todavía se está generando,
+    la carga se hizo en otro servidor o la versión ya fue reemplazada). En
+    ese caso la vista genera la respuesta directo, sin escribir en
+    EXPORT_ARTIFACTS_DIR.
+
+    Se abre aquí y no en la vista: una vez abierto, borrar la versión
+    anterior no corta la descarga.
+    """
+    version = get_data_version(clave)
+    if not version:
+        return None
+
+    try:
+        return open(artifact_path(formato, version, clave), 'rb')
+    except FileNotFoundError:
+        return None
+
+
+def schedule_rebuild(clave='chile.ipc'):
+    """
+    Regenera los exports en un hilo aparte. No es daemon, así que un
+    proceso de carga corto espera a que termine antes de salir.
+    """
+    def _run():
+        try:
+            build_artifacts(clave=clave)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=_run, name='ipc-export-artifacts')
+    thread.start()
+    return thread
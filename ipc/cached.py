@@ -0,0 +1,173 @@
+"""
+Respuestas en caché sin estampidas al vencer el TTL
+
+cached() y acached() guardan junto al valor cuánto costó calcularlo y
+cuándo vence, y al leerlo:
+
+- Vencimiento anticipado probabilístico (XFetch): poco antes de vencer,
+  cada lectura tiene una probabilidad creciente de pedir el recálculo, así
+  que normalmente se refresca una request antes de que venza para todas.
+- Stale-while-revalidate: un valor vencido se sigue sirviendo durante
+  IPC_CACHE_STALE_TIMEOUT segundos mientras se recalcula en segundo plano.
+- Single-flight: solo quien obtiene el lock (cache.add, atómico en
+  LocMemCache y en Redis) recalcula; en un fallo completo las demás
+  requests esperan ese valor en lugar de calcularlo también.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from .coalescing import coalesced
+
+logger = logging.getLogger(__name__)
+
+# Mayor que 1 adelanta los recálculos, menor que 1 los atrasa
+EARLY_EXPIRY_BETA = 1.0
+
+# Intervalo con que se revisa la caché mientras otra request recalcula
+LOCK_POLL_INTERVAL = 0.05
+
+# Tareas de refresco async en curso (referencia para que no se recolecten)
+_background = set()
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _entry(valor, delta, timeout):
+    return (valor, delta, time.time() + timeout)
+
+
+def _store_timeout(timeout):
+    # El valor vive más que su TTL para poder servirlo vencido
+    return timeout + settings.IPC_CACHE_STALE_TIMEOUT
+
+
+def _needs_refresh(delta, expira):
+    """
+    True si el valor venció o si XFetch decide refrescarlo antes: la
+    probabilidad crece al acercarse el vencimiento y con el costo del
+    cálculo (delta)
+    """
+    return time.time() - delta * EARLY_EXPIRY_BETA * math.log(1.0 - random.random()) >= expira
+
+
+def _fill(key, compute, timeout):
+    inicio = time.perf_counter()
+    valor = compute()
+    cache.set(key, _entry(valor, time.perf_counter() - inicio, timeout), _store_timeout(timeout))
+    return valor
+
+
+def _refresh_in_background(key, compute, timeout):
+    def _run():
+        try:
+            _fill(key, compute, timeout)
+        except Exception:
+            logger.exception(f"❌ Error recalculando {key}")
+        finally:
+            cache.delete(_lock_key(key))
+            connection.close()
+
+    threading.Thread(target=_run, name='ipc-cache-refresh', daemon=True).start()
+
+
+def cached(key, compute, timeout=None):
+    """
+    Valor de compute() en caché bajo key
+
+    Args:
+        key (str): Clave de caché (normalmente de versioned_key)
+        compute (callable): Calcula el valor; también corre en un hilo
+            aparte al refrescar en segundo plano
+        timeout (int): Segundos en que el valor está fresco. Por defecto
+            settings.IPC_CACHE_TIMEOUT.
+    """
+    if timeout is None:
+        timeout = settings.IPC_CACHE_TIMEOUT
+    lock_key = _lock_key(key)
+
+    entrada = cache.get(key)
+    if entrada is not None:
+        valor, delta, expira = entrada
+        if _needs_refresh(delta, expira) and cache.add(lock_key, 1, settings.IPC_CACHE_LOCK_TIMEOUT):
+            _refresh_in_background(key, compute, timeout)
+        return valor
+
+    if cache.add(lock_key, 1, settings.IPC_CACHE_LOCK_TIMEOUT):
+        try:
+            return _fill(key, compute, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    # Otra request está calculando: esperar su valor hasta que el lock venza
+    limite = time.monotonic() + settings.IPC_CACHE_LOCK_TIMEOUT
+    while time.monotonic() < limite:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entrada = cache.get(key)
+        if entrada is not None:
+            return entrada[0]
+
+    return _fill(key, compute, timeout)
+
+
+async def _afill(key, compute, timeout):
+    inicio = time.perf_counter()
+    valor = await compute()
+    await cache.aset(key, _entry(valor, time.perf_counter() - inicio, timeout), _store_timeout(timeout))
+    return valor
+
+
+async def _arefresh(key, compute, timeout):
+    try:
+        await _afill(key, compute, timeout)
+    except Exception:
+        logger.exception(f"❌ Error recalculando {key}")
+    finally:
+        await cache.adelete(_lock_key(key))
+
+
+async def acached(key, compute, timeout=None):
+    """
+    Versión async de cached(): compute es una función async y el refresco
+    en segundo plano es una tarea del event loop. Dentro del proceso las
+    requests que esperan la misma clave comparten una sola lectura.
+    """
+    if timeout is None:
+        timeout = settings.IPC_CACHE_TIMEOUT
+    lock_key = _lock_key(key)
+
+    entrada = await cache.aget(key)
+    if entrada is not None:
+        valor, delta, expira = entrada
+        if _needs_refresh(delta, expira) and await cache.aadd(lock_key, 1, settings.IPC_CACHE_LOCK_TIMEOUT):
+            tarea = asyncio.ensure_future(_arefresh(key, compute, timeout))
+            _background.add(tarea)
+            tarea.add_done_callback(_background.discard)
+        return valor
+
+    async def llenar():
+        if await cache.aadd(lock_key, 1, settings.IPC_CACHE_LOCK_TIMEOUT):
+            try:
+                return await _afill(key, compute, timeout)
+            finally:
+                await cache.adelete(lock_key)
+
+        # Otro proceso está calculando: esperar su valor hasta que el lock venza
+        limite = time.monotonic() + settings.IPC_CACHE_LOCK_TIMEOUT
+        while time.monotonic() < limite:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            entrada = await cache.aget(key)
+            if entrada is not None:
+                return entrada[0]
+
+        return await _afill(key, compute, timeout)
+
+    return await coalesced(key, llenar)
@@ -0,0 +1,218 @@
+"""
+Claves de caché versionadas por datos
+
+Cada carga incrementa la versión guardada en EstadisticasSerie; las claves de
+las respuestas derivadas la incluyen, así que una carga nueva invalida
+todas las vistas a la vez sin esperar a que venza el TTL.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from .coalescing import coalesced
+from .dataset import source_stat
+from .models import EstadisticasSerie, IPCData
+
+DATA_VERSION_KEY = 'ipc_data_version:{clave}'
+
+
+def _version_key(clave):
+    return DATA_VERSION_KEY.format(clave=clave)
+
+
+def reads_from_parquet():
+    """
+    True si las lecturas salen de los archivos Parquet
+    (settings.IPC_READ_BACKEND = 'parquet') y no de la base de datos
+    """
+    return settings.IPC_READ_BACKEND == 'parquet'
+
+
+def source_version(clave='chile.ipc'):
+    """
+    Versión de los datos en el backend 'parquet': mtime más reciente de
+    los archivos de la serie en milisegundos epoch (0 si no existen)
+    """
+    pais, tipo_dato = clave.split('.', 1)
+    try:
+        mtime, _ = source_stat(settings.PARQUET_FILES[pais][tipo_dato], pais, tipo_dato)
+    except (KeyError, FileNotFoundError):
+        return 0
+    return int(mtime * 1000)
+
+
+def get_data_version(clave='chile.ipc'):
+    """
+    Versión actual de los datos de la serie
+
+    Se lee de la caché y, si no está, de EstadisticasSerie (o de los
+    archivos en el backend 'parquet'). El valor en caché dura
+    IPC_DATA_VERSION_TIMEOUT segundos para que los procesos con caché
+    local (LocMemCache) vean cargas hechas desde otro proceso.
+    """
+    version = cache.get(_version_key(clave))
+
+    if version is None and reads_from_parquet():
+        version = source_version(clave)
+        cache.set(_version_key(clave), version, settings.IPC_DATA_VERSION_TIMEOUT)
+    elif version is None:
+        version = (
+            EstadisticasSerie.objects
+            .filter(pk=clave)
+            .values_list('version', flat=True)
+            .first()
+        ) or 0
+        cache.set(_version_key(clave), version, settings.IPC_DATA_VERSION_TIMEOUT)
+
+    return version
+
+
+async def aget_data_version(clave='chile.ipc'):
+    """
+    Versión async de get_data_version: caché async y ORM async. Las
+    requests concurrentes que no la encuentran en caché comparten una
+    sola lectura.
+    """
+    version = await cache.aget(_version_key(clave))
+    if version is not None:
+        return version
+
+    async def leer():
+        if reads_from_parquet():
+            version = source_version(clave)
+        else:
+            version = await (
+                EstadisticasSerie.objects
+                .filter(pk=clave)
+                .values_list('version', flat=True)
+                .afirst()
+            ) or 0
+        await cache.aset(_version_key(clave), version, settings.IPC_DATA_VERSION_TIMEOUT)
+        return version
+
+    return await coalesced(('version', clave), leer)
+
+
+def publish_data_version(clave, version):
+    """
+    Publica una nueva versión en la caché cuando la transacción que la
+    generó hace commit
+
+    En el backend 'parquet' la versión sale de los archivos, no de las
+    cargas a la base de datos.
+    """
+    if reads_from_parquet():
+        return
+
+    transaction.on_commit(
+        lambda: cache.set(_version_key(clave), version, settings.IPC_DATA_VERSION_TIMEOUT)
+    )
+
+
+def versioned_key(name, *parts, clave='chile.ipc'):
+    """
+    Clave de caché que incluye la versión de los datos:
+    'ipc:chile.ipc:v12:chart:24'
+    """
+    return _key(get_data_version(clave), name, parts, clave)
+
+
+async def aversioned_key(name, *parts, clave='chile.ipc'):
+    """
+    Versión async de versioned_key
+    """
+    return _key(await aget_data_version(clave), name, parts, clave)
+
+
+def _key(version, name, parts, clave):
+    key = f"ipc:{clave}:v{version}:{name}"
+    if parts:
+        key += ':' + ':'.join(str(part) for part in parts)
+    return key
+
+
+def _build_validators(clave, version, estado=None):
+    if version or reads_from_parquet():
+        etag = f'"{clave}-v{version}"'
+        last_modified = datetime.fromtimestamp(version / 1000, tz=dt_timezone.utc)
+    else:
+        last_modified = estado['ultimo']
+        etag = f'"{clave}-{estado["total"]}-{last_modified.timestamp() if last_modified else 0}"'
+    return etag, last_modified
+
+
+def _validators(request, clave='chile.ipc'):
+    """
+    (etag, last_modified) de los datos, calculados una vez por request
+
+    Con versión publicada no se consulta la base de datos: la versión ya
+    está en milisegundos epoch del último cambio (o del mtime de los
+    archivos en el backend 'parquet'). Sin versión (datos nunca procesados
+    por el loader) se usa max(updated_at) y el conteo.
+    """
+    if not hasattr(request, '_ipc_validators'):
+        version = get_data_version(clave)
+
+        estado = None
+        if not version and not reads_from_parquet():
+            estado = IPCData.objects.aggregate(ultimo=Max('updated_at'), total=Count('id'))
+
+        request._ipc_validators = _build_validators(clave, version, estado)
+
+    return request._ipc_validators
+
+
+async def _avalidators(request, clave='chile.ipc'):
+    """
+    Versión async de _validators (ORM y caché async)
+    """
+    if not hasattr(request, '_ipc_validators'):
+        version = await aget_data_version(clave)
+
+        estado = None
+        if not version and not reads_from_parquet():
+            estado = await IPCData.objects.aaggregate(ultimo=Max('updated_at'), total=Count('id'))
+
+        request._ipc_validators = _build_validators(clave, version, estado)
+
+    return request._ipc_validators
+
+
+def data_etag(request, *args, **kwargs):
+    return _validators(request)[0]
+
+
+def data_last_modified(request, *args, **kwargs):
+    return _validators(request)[1]
+
+
+def conditional_on_data(view_func):
+    """
+    Agrega ETag y Last-Modified según la versión de los datos y responde
+    304 a If-None-Match / If-Modified-Since sin ejecutar la vista.
+    Cache-Control: no-cache obliga al navegador a revalidar en cada sondeo.
+    """
+    view_func = condition(etag_func=data_etag, last_modified_func=data_last_modified)(view_func)
+    return cache_control(no_cache=True)(view_func)
+
+
+def aconditional_on_data(view_func):
+    """
+    conditional_on_data para vistas async
+
+    Los validadores se calculan antes con la caché y el ORM async; el
+    decorador condition (síncrono por dentro) solo los lee de la request.
+    """
+    view_func = conditional_on_data(view_func)
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        await _avalidators(request)
+        return await view_func(request, *args, **kwargs)
+
+    return wrapper
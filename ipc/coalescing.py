@@ -0,0 +1,32 @@
+"""
+Agrupación de lecturas concurrentes en las vistas async
+
+Cuando varias requests del mismo proceso piden la misma clave a la vez
+(por ejemplo, todos los dashboards sondeando justo después de una carga),
+solo la primera ejecuta la lectura; las demás esperan ese mismo
+resultado. Cada event loop tiene sus propias lecturas en curso.
+"""
+
+import asyncio
+
+_inflight = {}
+
+
+async def coalesced(clave, fetch):
+    """
+    Resultado de await fetch(), compartido entre las llamadas
+    concurrentes con la misma clave
+
+    Si una de las requests se cancela (cliente desconectado) la lectura
+    sigue para las demás. Un error se propaga a todas las que esperaban y
+    la siguiente llamada vuelve a intentar.
+    """
+    clave = (asyncio.get_running_loop(), clave)
+
+    tarea = _inflight.get(clave)
+    if tarea is None:
+        tarea = asyncio.ensure_future(fetch())
+        _inflight[clave] = tarea
+        tarea.add_done_callback(lambda _: _inflight.pop(clave, None))
+
+    return await asyncio.shield(tarea)
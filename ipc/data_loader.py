@@ -1,6 +1,19 @@
+import hashlib
+import os
+from contextlib import nullcontext
 import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from django.conf import settings
-from .models import IPCData
+from django.db import transaction
+from django.utils import timezone
+from .models import IPCData, FuenteDatos, Observacion
+from .dataset import open_dataset, partition_filter, source_files, source_stat
+from .parsing import parse_periodo_column, parse_decimal_column
+from .series import get_or_create_serie, upsert_observaciones
+from .stats import IPC_KEY, bump_ipc_version, has_ipc_version
+from .signals import suspend_version_bump
+from .artifacts import schedule_rebuild
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +23,21 @@ class IPCDataLoader:
     Clase para cargar datos desde Parquet a la base de datos
     """
 
+    EXPECTED_COLUMNS = ['Periodo', '1. Variación Mensual', '2. Variación Anual']
+
+    # Nombres de EXPECTED_COLUMNS en el dataset particionado (data/sources.json)
+    DATASET_COLUMNS = {
+        'Periodo': 'periodo',
+        '1. Variación Mensual': 'variacion_mensual',
+        '2. Variación Anual': 'variacion_anual',
+    }
+
+    # Columnas de IPCData que también se guardan en el modelo genérico de series
+    SERIES = {
+        'variacion_mensual': {'nombre': 'Variación Mensual (%)', 'frecuencia': 'M', 'unidad': '%'},
+        'variacion_anual': {'nombre': 'Variación Anual (%)', 'frecuencia': 'M', 'unidad': '%'},
+    }
+
     def __init__(self, country='chile', data_type='ipc'):
         """
         Inicializa el loader con país y tipo de datos específicos
@@ -21,6 +49,10 @@ class IPCDataLoader:
         self.country = country
         self.data_type = data_type
 
+        # IPCData guarda una sola serie (periodo es la clave, sin país ni
+        # tipo): las demás fuentes se escriben solo en Serie/Observacion
+        self.writes_ipcdata = f"{country}.{data_type}" == IPC_KEY
+
         # Obtener ruta del archivo Parquet
         try:
             self.parquet_path = settings.PARQUET_FILES[country][data_type]
@@ -29,102 +61,488 @@ class IPCDataLoader:
             self.parquet_path = settings.PARQUET_FILE_PATH
             logger.warning(f"Using fallback path for {country}/{data_type}")
     
-    def load_data(self):
+    def load_data(self, bulk=True, batch_size=None, incremental=False, chunk_size=None):
         """
         Carga datos desde Parquet a la base de datos
+
+        El archivo se lee por lotes de filas (record batches de pyarrow) y
+        solo con las tres columnas necesarias, así que la memoria usada no
+        depende del tamaño del archivo.
+
+        Args:
+            bulk (bool): Si es True, escribe con bulk_create/bulk_update en una
+                sola transacción, tocando solo filas nuevas o con valores
+                distintos. Si es False, usa update_or_create fila por fila
+                (modo anterior).
+            batch_size (int): Filas por lote de escritura en modo bulk. Por
+                defecto settings.IPC_LOADER_BATCH_SIZE.
+            incremental (bool): Si es True y el archivo no cambió desde la
+                última carga (según FuenteDatos), no se lee ni se escribe nada.
+            chunk_size (int): Filas leídas del Parquet por iteración. Por
+                defecto settings.IPC_LOADER_CHUNK_SIZE.
         """
         try:
-            print(f"📁 Leyendo archivo: {self.parquet_path}")
-            
-            # Leer Parquet
-            df = pd.read_parquet(self.parquet_path)
-            
-            print(f"📊 Filas encontradas: {len(df)}")
-            print(f"📋 Columnas: {df.columns.tolist()}")
+            if incremental:
+                omitida = self.unchanged_result()
+                if omitida is not None:
+                    return omitida
             
-            # Limpiar nombres de columnas
-            df.columns = df.columns.str.strip()
+            frames = self.read_frames(chunk_size)
+            if frames is None:
+                return None
             
-            # Verificar columnas esperadas
-            expected_cols = ['Periodo', '1. Variación Mensual', '2. Variación Anual']
-            missing_cols = [col for col in expected_cols if col not in df.columns]
+            return self.write_frames(frames, bulk, batch_size)
             
-            if missing_cols:
-                print(f"❌ Error: No se encontraron estas columnas: {missing_cols}")
-                print(f"📋 Columnas disponibles: {df.columns.tolist()}")
-                return None
+        except FileNotFoundError:
+            logger.error(f"❌ Error: No se encontró el archivo en: {self.parquet_path}")
+            logger.error("💡 Verifica que la ruta sea correcta y el archivo exista.")
+            return None
             
+        except Exception as e:
+            logger.exception(f"❌ Error inesperado: {e}")
+            return None
+    
+    def unchanged_result(self):
+        """
+        Resultado de una carga omitida si el archivo no cambió desde la
+        última carga (según FuenteDatos), o None si hay que cargarlo
+        """
+        fuente = FuenteDatos.objects.filter(pais=self.country, tipo_dato=self.data_type).first()
+        if not self._source_unchanged(fuente):
+            return None
+        
+        logger.info(f"⏭️  Sin cambios desde la última carga ({timezone.localtime(fuente.cargado_en):%d/%m/%Y %H:%M}), se omite")
+        return {'created': 0, 'updated': 0, 'unchanged': fuente.filas, 'errors': 0, 'skipped': True}
+    
+    def read_frames(self, chunk_size=None, memory_map=False):
+        """
+        Lee y parsea la fuente por lotes, sin tocar la base de datos
+
+        Args:
+            chunk_size (int): Filas leídas por iteración. Por defecto
+                settings.IPC_LOADER_CHUNK_SIZE.
+            memory_map (bool): Abrir los archivos con memory map (lecturas
+                repetidas de archivos que ya están en la caché del sistema)
+
+        Returns:
+            generator | None: Pares (registros, filas descartadas) por lote,
+            listos para write_frames; None si faltan columnas esperadas
+        """
+        if chunk_size is None:
+            chunk_size = getattr(settings, 'IPC_LOADER_CHUNK_SIZE', 5000)
+        
+        logger.info(f"📁 Leyendo {'dataset' if self._is_dataset() else 'archivo'}: {self.parquet_path}")
+        
+        if self._is_dataset():
+            # Solo los archivos de esta serie (filtro sobre las particiones)
+            dataset = open_dataset(self.parquet_path, memory_map=memory_map)
+            filtro = partition_filter(self.country, self.data_type)
+            logger.info(f"📊 Filas encontradas: {dataset.count_rows(filter=filtro)} en {len(self._source_files())} archivo(s)")
+            nombres = dataset.schema.names
+            columnas = {col: self.DATASET_COLUMNS[col] for col in self.EXPECTED_COLUMNS if self.DATASET_COLUMNS[col] in nombres}
+        else:
+            parquet_file = pq.ParquetFile(self.parquet_path, memory_map=memory_map)
+            logger.info(
+                f"📊 Filas encontradas: {parquet_file.metadata.num_rows} "
+                f"en {parquet_file.metadata.num_row_groups} row group(s)"
+            )
+            # Los nombres pueden venir con espacios
+            nombres = parquet_file.schema_arrow.names
+            columnas = {nombre.strip(): nombre for nombre in nombres}
+        
+        logger.debug(f"📋 Columnas: {nombres}")
+        
+        # Verificar columnas esperadas
+        missing_cols = [col for col in self.EXPECTED_COLUMNS if col not in columnas]
+        
+        if missing_cols:
+            logger.error(f"❌ Error: No se encontraron estas columnas: {missing_cols}")
+            logger.error(f"📋 Columnas disponibles: {nombres}")
+            return None
+        
+        if self._is_dataset():
+            # Columnas renombradas a EXPECTED_COLUMNS en el mismo escaneo
+            batches = dataset.to_batches(
+                columns={col: ds.field(columnas[col]) for col in self.EXPECTED_COLUMNS},
+                filter=filtro,
+                batch_size=chunk_size,
+            )
+        else:
+            batches = parquet_file.iter_batches(
+                batch_size=chunk_size,
+                columns=[columnas[col] for col in self.EXPECTED_COLUMNS],
+            )
+        
+        return self._parse_chunks(batches)
+    
+    def _parse_chunks(self, batches):
+        """
+        Parsea cada lote leído con _prepare_frame
+        """
+        for numero, df in enumerate(self._iter_chunks(batches)):
             # Limpiar datos
             df = df.dropna(subset=['Periodo'])
-            print(f"📊 Filas válidas después de limpiar: {len(df)}")
             
-            # Mostrar primeras filas para verificar
-            print("\n📋 Primeras 3 filas:")
-            print(df.head(3).to_string())
+            if numero == 0 and logger.isEnabledFor(logging.DEBUG):
+                # Mostrar primeras filas para verificar
+                logger.debug("📋 Primeras 3 filas:\n" + df.head(3).to_string())
             
-            # Procesar cada fila
-            created_count = 0
-            updated_count = 0
-            error_count = 0
+            # Parsear periodos y valores por columna
+            yield self._prepare_frame(df)
+    
+    def write_frames(self, frames, bulk=True, batch_size=None):
+        """
+        Escribe en la base de datos los lotes de read_frames, refresca las
+        estadísticas y guarda la marca de agua de la fuente
+
+        Solo la fuente IPC_KEY escribe en IPCData (y cambia su versión y
+        sus exports); las demás van directo a Serie/Observacion.
+
+        Returns:
+            dict: Conteos created, updated, unchanged, errors y skipped
+        """
+        totales = {'created': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+        filas_validas = 0
+        ultima_fecha = None
+        
+        # En modo bulk todos los lotes van en una sola transacción. La
+        # versión de los datos cambia una vez al final, no por cada fila.
+        with transaction.atomic() if bulk else nullcontext(), suspend_version_bump():
+            for numero, (registros, error_count) in enumerate(frames):
+                totales['errors'] += error_count
+                
+                if not self.writes_ipcdata:
+                    created_count, updated_count, unchanged_count = self._upsert_series_only(registros, batch_size)
+                elif bulk:
+                    created_count, updated_count, unchanged_count = self._bulk_upsert(registros, batch_size)
+                else:
+                    created_count, updated_count, row_errors = self._upsert_por_fila(registros)
+                    unchanged_count = 0
+                    totales['errors'] += row_errors
+                    self._sync_series(registros)
+                
+                totales['created'] += created_count
+                totales['updated'] += updated_count
+                totales['unchanged'] += unchanged_count
+                
+                filas_validas += len(registros)
+                if len(registros):
+                    maxima = registros['fecha'].max()
+                    ultima_fecha = maxima if ultima_fecha is None else max(ultima_fecha, maxima)
+                
+                logger.debug(f"📦 Lote {numero + 1}: {len(registros)} filas")
             
-            for index, row in df.iterrows():
-                try:
-                    periodo_raw = row['Periodo']
-                    
-                    # Convertir comas a puntos y manejar valores
-                    variacion_mensual = str(row['1. Variación Mensual']).replace(',', '.')
-                    variacion_anual = str(row['2. Variación Anual']).replace(',', '.')
-                    
-                    variacion_mensual = float(variacion_mensual)
-                    variacion_anual = float(variacion_anual)
-                    
-                    # Usar el nuevo método para parsear periodo y fecha
-                    periodo, fecha = IPCData.parse_periodo_and_fecha(periodo_raw)
-                    
-                    if fecha is None or periodo is None:
-                        print(f"⚠️  No se pudo parsear el periodo: {periodo_raw}")
-                        error_count += 1
-                        continue
-                    
-                    # Crear o actualizar registro
-                    obj, created = IPCData.objects.update_or_create(
-                        periodo=periodo,
-                        defaults={
-                            'fecha': fecha,
-                            'variacion_mensual': variacion_mensual,
-                            'variacion_anual': variacion_anual,
-                        }
-                    )
+            # Nueva versión de los datos, en la misma transacción que los datos
+            if self.writes_ipcdata and (totales['created'] or totales['updated'] or not has_ipc_version()):
+                bump_ipc_version()
+                
+                # Exports pre-generados de la nueva versión, después del commit
+                if settings.IPC_BUILD_EXPORT_ARTIFACTS:
+                    transaction.on_commit(lambda: schedule_rebuild(IPC_KEY))
+        
+        self._save_watermark(filas_validas, ultima_fecha)
+        
+        logger.info(
+            f"🎉 ¡Carga completada! ✅ Creados: {totales['created']} | "
+            f"🔄 Actualizados: {totales['updated']} | "
+            f"⏸️  Sin cambios: {totales['unchanged']} | "
+            f"❌ Errores: {totales['errors']}"
+        )
+        
+        return {**totales, 'skipped': False}
+    
+    def _iter_chunks(self, batches):
+        """
+        Convierte los record batches (solo las columnas esperadas, a lo más
+        chunk_size filas cada uno) en DataFrames
+        """
+        for batch in batches:
+            df = batch.to_pandas()
+            # Limpiar nombres de columnas
+            df.columns = df.columns.str.strip()
+            yield df
+    
+    def _prepare_frame(self, df):
+        """
+        Convierte el DataFrame crudo en columnas listas para el modelo,
+        sin recorrer filas en Python
+
+        Returns:
+            tuple: (DataFrame con periodo, fecha, variacion_mensual y
+            variacion_anual; cantidad de filas descartadas)
+        """
+        periodos, fechas, invalidos = parse_periodo_column(df['Periodo'])
+        
+        registros = pd.DataFrame({
+            'periodo': periodos,
+            'fecha': fechas,
+            'variacion_mensual': parse_decimal_column(df['1. Variación Mensual']),
+            'variacion_anual': parse_decimal_column(df['2. Variación Anual']),
+        })
+        
+        for col in ['variacion_mensual', 'variacion_anual']:
+            # Redondear a los decimales del DecimalField (float32 -> 0.30000001)
+            decimales = IPCData._meta.get_field(col).decimal_places
+            registros[col] = registros[col].round(decimales)
+        
+        if invalidos.any():
+            logger.warning(f"⚠️  No se pudo parsear el periodo: {df.loc[invalidos, 'Periodo'].tolist()[:5]}")
+        
+        valores_invalidos = ~invalidos & registros[['variacion_mensual', 'variacion_anual']].isna().any(axis=1)
+        if valores_invalidos.any():
+            logger.warning(f"⚠️  Valores no numéricos en: {registros.loc[valores_invalidos, 'periodo'].tolist()[:5]}")
+        
+        descartados = invalidos | valores_invalidos
+        registros = registros[~descartados]
+        
+        # Si el periodo se repite gana la última fila, igual que update_or_create
+        registros = registros.drop_duplicates(subset='periodo', keep='last')
+        
+        return registros, int(descartados.sum())
+    
+    def _upsert_por_fila(self, registros):
+        """
+        Modo anterior: un update_or_create por fila (SELECT + INSERT/UPDATE)
+        """
+        created_count = 0
+        updated_count = 0
+        error_count = 0
+        
+        for registro in registros.itertuples(index=False):
+            try:
+                periodo = registro.periodo
+                
+                # Crear o actualizar registro
+                obj, created = IPCData.objects.update_or_create(
+                    periodo=periodo,
+                    defaults={
+                        'fecha': registro.fecha.date(),
+                        'variacion_mensual': registro.variacion_mensual,
+                        'variacion_anual': registro.variacion_anual,
+                    }
+                )
+                
+                if created:
+                    created_count += 1
+                    if created_count <= 5:  # Mostrar solo los primeros 5
+                        logger.debug(f"✅ Creado: {periodo} -> {registro.variacion_mensual}% / {registro.variacion_anual}%")
+                else:
+                    updated_count += 1
+                    if updated_count <= 2:  # Mostrar solo los primeros 2 updates
+                        logger.debug(f"🔄 Actualizado: {periodo} -> {registro.variacion_mensual}% / {registro.variacion_anual}%")
                     
-                    if created:
-                        created_count += 1
-                        if created_count <= 5:  # Mostrar solo los primeros 5
-                            print(f"✅ Creado: {periodo} -> {variacion_mensual}% / {variacion_anual}%")
-                    else:
-                        updated_count += 1
-                        if updated_count <= 2:  # Mostrar solo los primeros 2 updates
-                            print(f"🔄 Actualizado: {periodo} -> {variacion_mensual}% / {variacion_anual}%")
-                        
-                except Exception as e:
-                    print(f"❌ Error procesando fila {index}: {e}")
-                    error_count += 1
-                    continue
-            
-            print(f"\n🎉 ¡Carga completada!")
-            print(f"   ✅ Creados: {created_count}")
-            print(f"   🔄 Actualizados: {updated_count}")
-            print(f"   ❌ Errores: {error_count}")
-            
-            return {'created': created_count, 'updated': updated_count, 'errors': error_count}
-            
-        except FileNotFoundError:
-            print(f"❌ Error: No se encontró el archivo en: {self.parquet_path}")
-            print("💡 Verifica que la ruta sea correcta y el archivo exista.")
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error inesperado: {e}")
-            return None
+            except Exception as e:
+                logger.error(f"❌ Error procesando periodo {registro.periodo}: {e}")
+                error_count += 1
+                continue
+        
+        return created_count, updated_count, error_count
+    
+    def _bulk_upsert(self, registros, batch_size=None):
+        """
+        Modo bulk: una consulta para las filas existentes del lote,
+        bulk_create para filas nuevas y bulk_update solo para las que
+        cambiaron. Las filas idénticas no se tocan (updated_at se mantiene).
+        Debe llamarse dentro de la transacción abierta por load_data.
+        """
+        if batch_size is None:
+            batch_size = getattr(settings, 'IPC_LOADER_BATCH_SIZE', 500)
+        
+        # Una sola consulta para las filas existentes de este lote (sin el
+        # ordering por defecto: el cruce no necesita orden y así no se ordena)
+        existentes = pd.DataFrame.from_records(
+            IPCData.objects.filter(periodo__in=registros['periodo'].tolist()).order_by().values_list(
+                'periodo', 'id', 'fecha', 'variacion_mensual', 'variacion_anual'
+            ),
+            columns=['periodo', 'id', 'fecha_db', 'mensual_db', 'anual_db']
+        )
+        existentes['periodo'] = existentes['periodo'].astype('string')
+        
+        cruce = registros.merge(existentes, on='periodo', how='left')
+        es_nuevo = cruce['id'].isna()
+        
+        cambiado = ~es_nuevo & (
+            (cruce['fecha'] != pd.to_datetime(cruce['fecha_db']))
+            | (cruce['variacion_mensual'] != cruce['mensual_db'].astype('float64'))
+            | (cruce['variacion_anual'] != cruce['anual_db'].astype('float64'))
+        )
+        
+        # bulk_update no ejecuta auto_now, así que updated_at se asigna aquí
+        ahora = timezone.now()
+        nuevos = self._build_objects(cruce[es_nuevo])
+        actualizados = self._build_objects(cruce[cambiado], con_id=True, updated_at=ahora)
+        
+        IPCData.objects.bulk_create(nuevos, batch_size=batch_size)
+        IPCData.objects.bulk_update(
+            actualizados,
+            ['fecha', 'variacion_mensual', 'variacion_anual', 'updated_at'],
+            batch_size=batch_size
+        )
+        
+        # Solo las filas nuevas o modificadas pasan al modelo de series
+        self._sync_series(cruce[es_nuevo | cambiado], batch_size)
+        
+        sin_cambios = len(cruce) - len(nuevos) - len(actualizados)
+        
+        logger.debug(f"✅ Creados en bloque: {len(nuevos)} (lotes de {batch_size})")
+        logger.debug(f"🔄 Actualizados en bloque: {len(actualizados)}")
+        
+        return len(nuevos), len(actualizados), sin_cambios
+    
+    @staticmethod
+    def _build_objects(registros, con_id=False, **extra):
+        """
+        Instancias de IPCData a partir de las columnas ya parseadas
+        """
+        ids = registros['id'].astype('int64').tolist() if con_id else [None] * len(registros)
+        columnas = zip(
+            ids,
+            registros['periodo'].tolist(),
+            registros['fecha'].dt.date.tolist(),
+            registros['variacion_mensual'].tolist(),
+            registros['variacion_anual'].tolist(),
+        )
+        return [
+            IPCData(
+                id=pk,
+                periodo=periodo,
+                fecha=fecha,
+                variacion_mensual=mensual,
+                variacion_anual=anual,
+                **extra
+            )
+            for pk, periodo, fecha, mensual, anual in columnas
+        ]
+    
+    def _upsert_series_only(self, registros, batch_size=None):
+        """
+        Fuentes distintas de IPC_KEY: una consulta por serie para las
+        observaciones existentes del lote y upsert solo de las fechas nuevas
+        o con algún valor distinto
+        """
+        fechas = registros['fecha'].dt.date
+        es_nuevo = pd.Series(False, index=registros.index)
+        cambiado = pd.Series(False, index=registros.index)
+        
+        for columna, serie in self.get_series().items():
+            existentes = dict(
+                Observacion.objects.filter(serie=serie, fecha__in=fechas.tolist()).order_by().values_list('fecha', 'valor')
+            )
+            actuales = fechas.map(existentes)
+            es_nuevo |= actuales.isna()
+            cambiado |= actuales.notna() & (actuales.astype('float64') != registros[columna])
+        
+        cambiado &= ~es_nuevo
+        self._sync_series(registros[es_nuevo | cambiado], batch_size)
+        
+        return int(es_nuevo.sum()), int(cambiado.sum()), int((~es_nuevo & ~cambiado).sum())
+    
+    def get_series(self):
+        """
+        Series del catálogo de esta fuente, una por columna de SERIES
+        """
+        if not hasattr(self, '_series'):
+            self._series = {
+                columna: get_or_create_serie(self.country, f"{self.data_type}.{columna}", **meta)
+                for columna, meta in self.SERIES.items()
+            }
+        return self._series
+    
+    def _sync_series(self, registros, batch_size=None):
+        """
+        Replica las columnas de SERIES en Observacion (una serie por columna)
+        """
+        if not len(registros):
+            return
+        
+        if batch_size is None:
+            batch_size = getattr(settings, 'IPC_LOADER_BATCH_SIZE', 500)
+        
+        fechas = registros['fecha'].dt.date.tolist()
+        for columna, serie in self.get_series().items():
+            upsert_observaciones(serie, fechas, registros[columna].tolist(), batch_size)
+    
+    def _is_dataset(self):
+        """
+        True si la ruta configurada es un dataset particionado (directorio)
+        """
+        return os.path.isdir(self.parquet_path)
+    
+    def _source_files(self):
+        """
+        Archivos de los que sale esta serie: el Parquet configurado o los
+        de su partición en el dataset
+        """
+        return source_files(self.parquet_path, self.country, self.data_type)
+    
+    def _source_stat(self):
+        """
+        (mtime, tamaño) de la fuente; en un dataset, el mtime más reciente
+        y el tamaño total de los archivos de la serie
+        """
+        return source_stat(self.parquet_path, self.country, self.data_type)
+    
+    def _content_hash(self):
+        """
+        SHA-256 de la fuente, leída en bloques (en un dataset, todos los
+        archivos de la serie en orden)
+        """
+        firma = self._source_stat()
+        
+        # Evitar leer el archivo dos veces en la misma carga
+        if getattr(self, '_hash_firma', None) == firma:
+            return self._hash
+        
+        digest = hashlib.sha256()
+        for ruta in self._source_files():
+            with open(ruta, 'rb') as f:
+                for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(bloque)
+        
+        self._hash_firma = firma
+        self._hash = digest.hexdigest()
+        return self._hash
+    
+    def _source_unchanged(self, fuente):
+        """
+        Compara el archivo con la marca de agua: primero mtime y tamaño
+        (sin leer el archivo) y, si difieren, el hash del contenido
+        """
+        mtime, tamano = self._source_stat()
+        
+        if fuente is None or fuente.ruta != str(self.parquet_path):
+            return False
+        
+        if fuente.mtime == mtime and fuente.tamano == tamano:
+            return True
+        
+        if fuente.hash_contenido and fuente.hash_contenido == self._content_hash():
+            # Mismo contenido con otra fecha de modificación (copia, checkout...)
+            fuente.mtime = mtime
+            fuente.tamano = tamano
+            fuente.save(update_fields=['mtime', 'tamano', 'cargado_en'])
+            return True
+        
+        return False
+    
+    def _save_watermark(self, filas, ultima_fecha):
+        """
+        Guarda mtime, hash y última fecha del archivo recién cargado
+        """
+        mtime, tamano = self._source_stat()
+        
+        FuenteDatos.objects.update_or_create(
+            pais=self.country,
+            tipo_dato=self.data_type,
+            defaults={
+                'ruta': str(self.parquet_path),
+                'mtime': mtime,
+                'tamano': tamano,
+                'hash_contenido': self._content_hash(),
+                'ultima_fecha': ultima_fecha.date() if ultima_fecha is not None else None,
+                'filas': filas,
+            }
+        )
     
     def get_data_summary(self):
         """
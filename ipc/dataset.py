@@ -0,0 +1,90 @@
+"""
+Dataset Parquet particionado por país, indicador y año
+
+Estructura (particiones estilo Hive):
+
+    data/parquet/dataset/pais=chile/indicador=ipc/anio=2011/part-0.parquet
+
+Cada archivo tiene las filas de un año ordenadas por fecha y con
+estadísticas por row group, así que un filtro por país/indicador solo
+abre los archivos que corresponden (predicate pushdown).
+
+No depende de Django: lo usan el script convert_to_parquet.py y sus
+procesos de trabajo, además del loader.
+"""
+
+import os
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+# Compresión de todos los Parquet generados (dataset y exports)
+PARQUET_COMPRESSION = 'snappy'
+
+PARTITION_COLUMNS = ['pais', 'indicador', 'anio']
+
+
+def partition_dir(raiz, pais, indicador):
+    """
+    Directorio con todos los años de una serie
+    """
+    return os.path.join(raiz, f'pais={pais}', f'indicador={indicador}')
+
+
+def partition_files(raiz, pais, indicador):
+    """
+    Archivos Parquet de una serie, en orden (año y nombre)
+    """
+    base = partition_dir(raiz, pais, indicador)
+    archivos = []
+
+    for directorio, subdirectorios, nombres in os.walk(base):
+        # Igual que pyarrow: se ignoran temporales ('.') y metadatos ('_')
+        subdirectorios[:] = sorted(d for d in subdirectorios if not d.startswith(('.', '_')))
+        archivos.extend(
+            os.path.join(directorio, nombre)
+            for nombre in sorted(nombres)
+            if nombre.endswith('.parquet') and not nombre.startswith(('.', '_'))
+        )
+
+    return archivos
+
+
+def source_files(ruta, pais, indicador):
+    """
+    Archivos de los que sale una serie: la ruta misma si es un Parquet o
+    los de su partición si es un dataset
+    """
+    if os.path.isdir(ruta):
+        return partition_files(ruta, pais, indicador)
+    return [ruta]
+
+
+def source_stat(ruta, pais, indicador):
+    """
+    (mtime, tamaño) de la fuente de una serie; en un dataset, el mtime
+    más reciente y el tamaño total de sus archivos
+    """
+    stats = [os.stat(archivo) for archivo in source_files(ruta, pais, indicador)]
+    if not stats:
+        raise FileNotFoundError(ruta)
+    return max(stat.st_mtime for stat in stats), sum(stat.st_size for stat in stats)
+
+
+def open_dataset(raiz, memory_map=False):
+    """
+    Dataset con las particiones pais/indicador/anio descubiertas desde
+    los nombres de directorio
+
+    Con memory_map los archivos se mapean en memoria en lugar de leerse
+    con copias a buffers propios.
+    """
+    filesystem = fs.LocalFileSystem(use_mmap=True) if memory_map else None
+    return ds.dataset(raiz, format='parquet', partitioning='hive', filesystem=filesystem)
+
+
+def partition_filter(pais, indicador):
+    """
+    Expresión de filtro para una serie. Las condiciones sobre particiones
+    descartan archivos completos sin abrirlos.
+    """
+    return (ds.field('pais') == pais) & (ds.field('indicador') == indicador)
@@ -0,0 +1,97 @@
+"""
+Reducción de puntos para gráficos de ventanas largas
+
+Ambos métodos devuelven índices sobre la serie original (siempre incluyen
+el primer y el último punto), para aplicar el mismo corte a etiquetas y
+valores:
+
+- 'lttb': Largest-Triangle-Three-Buckets. Conserva la forma visual de la
+  serie eligiendo en cada tramo el punto que forma el triángulo más grande
+  con el punto anterior elegido y el promedio del tramo siguiente.
+- 'minmax': Mínimo y máximo de cada tramo; conserva los extremos.
+"""
+
+import numpy as np
+
+DOWNSAMPLERS = ['lttb', 'minmax']
+
+# Mínimo de puntos pedidos (primero, último y al menos uno intermedio)
+MIN_POINTS = 3
+
+
+def lttb_indices(valores, n):
+    """
+    Índices de los n puntos elegidos por LTTB
+
+    Cada tramo depende del punto elegido en el anterior, así que se
+    recorren los n - 2 tramos en orden; dentro del tramo el cálculo es
+    vectorizado.
+    """
+    total = len(valores)
+    if n >= total:
+        return np.arange(total)
+
+    # n - 2 tramos entre el primer y el último punto
+    bordes = np.linspace(1, total - 1, n - 1).astype(int)
+    elegidos = np.empty(n, dtype=int)
+    elegidos[0], elegidos[-1] = 0, total - 1
+
+    anterior = 0
+    for i in range(n - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        siguiente_fin = bordes[i + 2] if i + 2 < len(bordes) else total
+
+        # Promedio del tramo siguiente (el último punto para el último tramo)
+        x_siguiente = (fin + siguiente_fin - 1) / 2
+        y_siguiente = valores[fin:siguiente_fin].mean()
+
+        x = np.arange(inicio, fin)
+        areas = np.abs(
+            (anterior - x_siguiente) * (valores[inicio:fin] - valores[anterior])
+            - (anterior - x) * (y_siguiente - valores[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        elegidos[i + 1] = anterior
+
+    return elegidos
+
+
+def minmax_indices(valores, n):
+    """
+    Índices del mínimo y el máximo de cada uno de (n - 2) // 2 tramos,
+    más el primer y el último punto, en una sola pasada vectorizada
+    """
+    total = len(valores)
+    if n >= total:
+        return np.arange(total)
+
+    tramos = (n - 2) // 2
+    if not tramos:
+        return np.array([0, total - 1])
+    tramo = np.arange(total) * tramos // total
+
+    # Orden por (tramo, valor): el primero de cada tramo es su mínimo y el
+    # último su máximo
+    orden = np.lexsort((valores, tramo))
+    inicios = np.flatnonzero(np.diff(tramo[orden], prepend=-1))
+    finales = np.append(inicios[1:], total) - 1
+
+    return np.unique(np.concatenate(([0, total - 1], orden[inicios], orden[finales])))
+
+
+def downsample_indices(series, max_points, metodo='lttb'):
+    """
+    Índices comunes para varias series alineadas (a lo más max_points)
+
+    Cada serie aporta su propia selección y se usa la unión, así se
+    conserva la forma de todas. El primer y el último punto son comunes,
+    los intermedios se reparten entre las series.
+    """
+    total = len(series[0])
+    if max_points >= total:
+        return np.arange(total)
+
+    por_serie = (max_points - 2) // len(series) + 2
+    seleccion = lttb_indices if metodo == 'lttb' else minmax_indices
+
+    return np.unique(np.concatenate([seleccion(valores, por_serie) for valores in series]))
@@ -0,0 +1,274 @@
+"""
+Exportación de datos IPC a archivos
+
+El Excel se escribe en modo write-only de openpyxl: las filas se leen de
+la base de datos con un iterador y se vuelcan hoja por hoja, sin armar
+el libro completo en memoria. CSV, Parquet y Arrow se arman por lotes
+de filas (record batches) desde el mismo tipo de iterador.
+"""
+
+import csv
+import io
+from itertools import islice
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from .dataset import PARQUET_COMPRESSION
+from .models import IPCData
+
+EXCEL_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+EXCEL_COLUMNS = [
+    'Período',
+    'Fecha',
+    'Variación Mensual (%)',
+    'Variación Anual (%)',
+    'Fecha Actualización',
+]
+
+# 12 meses por hoja
+ROWS_PER_SHEET = 12
+MAX_COLUMN_WIDTH = 50
+ITERATOR_CHUNK_SIZE = 2000
+
+
+def _excel_rows(queryset):
+    """
+    Filas formateadas para el Excel, leídas en bloques desde la base de datos
+    """
+    registros = queryset.order_by('-fecha').values_list(
+        'periodo', 'fecha', 'variacion_mensual', 'variacion_anual', 'updated_at'
+    ).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+    for periodo, fecha, mensual, anual, updated_at in registros:
+        yield (
+            periodo,
+            fecha.strftime('%d/%m/%Y'),
+            float(mensual),
+            float(anual),
+            updated_at.strftime('%d/%m/%Y %H:%M'),
+        )
+
+
+def _write_sheet(workbook, title, header, rows):
+    """
+    Escribe una hoja completa. Los anchos de columna se calculan antes de
+    escribir (en write-only no se pueden ajustar después) a partir del
+    máximo de cada columna.
+    """
+    worksheet = workbook.create_sheet(title)
+
+    widths = [len(str(value)) for value in header]
+    for row in rows:
+        widths = [max(width, len(str(value))) for width, value in zip(widths, row)]
+
+    for index, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(index)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+    header_cells = []
+    for value in header:
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+
+    worksheet.append(header_cells)
+    for row in rows:
+        worksheet.append(row)
+
+
+def write_ipc_workbook(destino, queryset=None):
+    """
+    Escribe el Excel de datos IPC (hojas de 12 meses + hoja 'Resumen')
+
+    Args:
+        destino: Ruta o archivo binario con seek (p.ej. un TemporaryFile)
+        queryset: Datos a exportar; por defecto todo IPCData
+
+    Returns:
+        int: Cantidad de registros exportados
+    """
+    if queryset is None:
+        queryset = IPCData.objects.all()
+
+    workbook = Workbook(write_only=True)
+    rows = _excel_rows(queryset)
+
+    # Estadísticas acumuladas en la misma pasada
+    total = 0
+    mas_reciente = mas_antiguo = None
+    suma_mensual = suma_anual = 0.0
+    max_mensual = min_mensual = max_anual = min_anual = None
+
+    sheet_number = 1
+    while True:
+        sheet_rows = list(islice(rows, ROWS_PER_SHEET))
+        if not sheet_rows:
+            break
+
+        _write_sheet(workbook, f'Página {sheet_number}', EXCEL_COLUMNS, sheet_rows)
+
+        for periodo, _, mensual, anual, _ in sheet_rows:
+            if mas_reciente is None:
+                mas_reciente = periodo
+                max_mensual = min_mensual = mensual
+                max_anual = min_anual = anual
+            mas_antiguo = periodo
+            suma_mensual += mensual
+            suma_anual += anual
+            max_mensual = max(max_mensual, mensual)
+            min_mensual = min(min_mensual, mensual)
+            max_anual = max(max_anual, anual)
+            min_anual = min(min_anual, anual)
+
+        total += len(sheet_rows)
+        sheet_number += 1
+
+    if total:
+        # Hoja resumen
+        summary_rows = [
+            ('Total de Registros', total),
+            ('Período Más Antiguo', mas_antiguo),
+            ('Período Más Reciente', mas_reciente),
+            ('Promedio Variación Mensual', f"{suma_mensual / total:.2f}%"),
+            ('Promedio Variación Anual', f"{suma_anual / total:.2f}%"),
+            ('Máxima Variación Mensual', f"{max_mensual:.2f}%"),
+            ('Mínima Variación Mensual', f"{min_mensual:.2f}%"),
+            ('Máxima Variación Anual', f"{max_anual:.2f}%"),
+            ('Mínima Variación Anual', f"{min_anual:.2f}%"),
+        ]
+        _write_sheet(workbook, 'Resumen', ['Estadística', 'Valor'], summary_rows)
+
+    workbook.save(destino)
+    return total
+
+
+# Formatos columnares para consumidores de datos
+EXPORT_FIELDS = ['periodo', 'fecha', 'variacion_mensual', 'variacion_anual']
+
+ARROW_SCHEMA = pa.schema([
+    ('periodo', pa.string()),
+    ('fecha', pa.date32()),
+    ('variacion_mensual', pa.float64()),
+    ('variacion_anual', pa.float64()),
+])
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+EXPORT_EXTENSIONS = {
+    'csv': 'csv',
+    'parquet': 'parquet',
+    'arrow': 'arrows',
+}
+
+
+def _export_rows(queryset):
+    """
+    Tuplas (periodo, fecha, mensual, anual) en orden cronológico, leídas
+    con un cursor por bloques
+    """
+    return queryset.order_by('fecha').values_list(*EXPORT_FIELDS).iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+
+
+def iter_record_batches(queryset, batch_size=ITERATOR_CHUNK_SIZE):
+    """
+    Record batches de Arrow con a lo más batch_size filas cada uno
+    """
+    rows = _export_rows(queryset)
+
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+
+        periodos, fechas, mensuales, anuales = zip(*chunk)
+
+        # float(Decimal) redondea al double más cercano (el cast de
+        # decimal128 de Arrow deja 2.6999999999999997)
+        yield pa.record_batch([
+            pa.array(periodos, pa.string()),
+            pa.array(fechas, pa.date32()),
+            pa.array(map(float, mensuales), pa.float64()),
+            pa.array(map(float, anuales), pa.float64()),
+        ], schema=ARROW_SCHEMA)
+
+
+class _Echo:
+    """
+    Pseudo-archivo para csv.writer: writerow() devuelve la línea escrita
+    """
+
+    def write(self, value):
+        return value
+
+
+class _Drain(io.BytesIO):
+    """
+    Buffer de escritura que se vacía con take() después de cada mensaje
+    """
+
+    def take(self):
+        data = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return data
+
+
+def stream_csv(queryset):
+    """
+    Generador de bytes CSV (encabezado + filas), para StreamingHttpResponse
+    """
+    writer = csv.writer(_Echo())
+
+    yield writer.writerow(EXPORT_FIELDS).encode('utf-8')
+
+    rows = _export_rows(queryset)
+    while True:
+        chunk = list(islice(rows, ITERATOR_CHUNK_SIZE))
+        if not chunk:
+            break
+        yield ''.join(
+            writer.writerow((periodo, fecha.isoformat(), mensual, anual))
+            for periodo, fecha, mensual, anual in chunk
+        ).encode('utf-8')
+
+
+def stream_arrow(queryset):
+    """
+    Generador de bytes en formato Arrow IPC stream: el esquema y luego un
+    mensaje por record batch, listo para pyarrow.ipc.open_stream
+    """
+    drain = _Drain()
+
+    with pa.ipc.new_stream(drain, ARROW_SCHEMA) as writer:
+        yield drain.take()
+        for batch in iter_record_batches(queryset):
+            writer.write_batch(batch)
+            yield drain.take()
+
+    # Marca de fin de stream
+    yield drain.take()
+
+
+def write_parquet(destino, queryset):
+    """
+    Escribe un Parquet (snappy) por record batches; cada lote queda como
+    un row group con sus estadísticas
+
+    Returns:
+        int: Cantidad de filas escritas
+    """
+    total = 0
+
+    with pq.ParquetWriter(destino, ARROW_SCHEMA, compression=PARQUET_COMPRESSION) as writer:
+        for batch in iter_record_batches(queryset):
+            writer.write_batch(batch)
+            total += batch.num_rows
+
+    return total
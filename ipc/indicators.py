@@ -0,0 +1,165 @@
+"""
+Indicadores derivados de la serie IPC
+
+Se calculan con NumPy sobre la copia en memoria (ipc/snapshot.py) y se
+guardan por versión de los datos: después de la primera consulta, pedir
+un indicador derivado cuesta lo mismo que leer la serie original.
+
+Todas las series derivadas están alineadas con las fechas de la serie;
+los meses sin historia suficiente quedan en NaN (null en JSON).
+"""
+
+import threading
+import numpy as np
+from .snapshot import IPCSnapshot
+
+# Decimales de las series derivadas
+DERIVED_DIGITS = 4
+
+DEFAULT_WINDOW = 12
+
+# Ventana máxima de la media móvil (10 años). Cada ventana distinta queda
+# memoizada hasta que cambie la versión, así que el total está acotado.
+MAX_WINDOW = 120
+
+_memo = {}
+_memo_version = {}
+_lock = threading.Lock()
+
+
+def _factors(mensual):
+    # Variación mensual en % -> factor de crecimiento del mes
+    return 1 + mensual / 100
+
+
+def rolling_mean(valores, window):
+    """
+    Media móvil de window meses (NaN en los primeros window - 1)
+    """
+    resultado = np.full(len(valores), np.nan)
+    if 0 < window <= len(valores):
+        acumulado = np.cumsum(np.insert(valores, 0, 0.0))
+        resultado[window - 1:] = (acumulado[window:] - acumulado[:-window]) / window
+    return resultado
+
+
+def annualized_rate(mensual, months):
+    """
+    Variación de los últimos `months` meses llevada a tasa anual (%):
+    (prod(1 + m/100) ^ (12 / months) - 1) * 100
+    """
+    resultado = np.full(len(mensual), np.nan)
+    if 0 < months <= len(mensual):
+        # Producto móvil como suma móvil de logaritmos
+        logs = np.cumsum(np.insert(np.log(_factors(mensual)), 0, 0.0))
+        ventana = logs[months:] - logs[:-months]
+        resultado[months - 1:] = np.expm1(ventana * 12 / months) * 100
+    return resultado
+
+
+def price_index(mensual, base=100.0):
+    """
+    Índice de precios reconstruido componiendo las variaciones mensuales,
+    con valor `base` el mes anterior al primer dato
+    """
+    return base * np.cumprod(_factors(mensual))
+
+
+def cumulative_inflation(mensual):
+    """
+    Inflación acumulada (%) de un tramo de variaciones mensuales, o None
+    si el tramo está vacío
+    """
+    if not len(mensual):
+        return None
+    return float(np.prod(_factors(mensual)) - 1) * 100
+
+
+# Indicadores disponibles en la API: nombre -> función(snapshot, window)
+INDICATORS = {
+    'rolling_mean': lambda snapshot, window: rolling_mean(snapshot.mensual, window),
+    'annualized_3m': lambda snapshot, window: annualized_rate(snapshot.mensual, 3),
+    'annualized_6m': lambda snapshot, window: annualized_rate(snapshot.mensual, 6),
+    'index': lambda snapshot, window: price_index(snapshot.mensual),
+}
+
+
+def _memoized(snapshot, clave_memo, calcular, clave='chile.ipc'):
+    """
+    Resultado de calcular() guardado hasta que cambie la versión de los
+    datos; al cambiar se descartan todos los resultados anteriores
+    """
+    with _lock:
+        if _memo_version.get(clave) != snapshot.version:
+            for existente in [k for k in _memo if k[0] == clave]:
+                del _memo[existente]
+            _memo_version[clave] = snapshot.version
+
+        resultado = _memo.get((clave,) + clave_memo)
+        if resultado is None:
+            resultado = calcular()
+            _memo[(clave,) + clave_memo] = resultado
+
+    return resultado
+
+
+def derived_series(snapshot, nombre, window=DEFAULT_WINDOW, clave='chile.ipc'):
+    """
+    Serie derivada completa, memoizada por versión de los datos
+
+    Returns:
+        numpy.ndarray: Valores alineados con snapshot.fechas (solo lectura)
+    """
+    def calcular():
+        valores = np.round(INDICATORS[nombre](snapshot, window), DERIVED_DIGITS)
+        valores.flags.writeable = False
+        return valores
+
+    # Solo 'rolling_mean' depende de la ventana
+    return _memoized(snapshot, ('derived', nombre, window if nombre == 'rolling_mean' else None), calcular, clave)
+
+
+# Frecuencias de agregación: 'Q' trimestral, 'Y' anual ('M' es la serie original)
+FREQUENCIES = ['M', 'Q', 'Y']
+
+
+def _period_labels(anios, trimestres, freq):
+    if freq == 'Q':
+        return np.array([f"T{trimestre + 1}.{anio}" for anio, trimestre in zip(anios.tolist(), trimestres.tolist())], dtype=object)
+    return np.array([str(anio) for anio in anios.tolist()], dtype=object)
+
+
+def resample(snapshot, freq, clave='chile.ipc'):
+    """
+    Serie agregada por trimestre ('Q') o año ('Y'), memoizada por versión
+
+    En cada período la variación "mensual" pasa a ser la variación
+    compuesta del período, prod(1 + m/100) - 1, y la anual es la del
+    último mes del período. El período en curso puede estar incompleto.
+
+    Returns:
+        IPCSnapshot: Un registro por período (fecha = primer mes del período)
+    """
+    if freq == 'M' or not len(snapshot):
+        return snapshot
+
+    def calcular():
+        anios = snapshot.fechas.astype('datetime64[Y]').astype(int) + 1970
+        trimestres = (snapshot.fechas.astype('datetime64[M]').astype(int) % 12) // 3
+        grupos = anios * 4 + trimestres if freq == 'Q' else anios
+
+        # La serie está ordenada: cada cambio de grupo abre un período
+        inicios = np.insert(np.flatnonzero(np.diff(grupos)) + 1, 0, 0)
+        finales = np.append(inicios[1:], len(grupos)) - 1
+
+        compuesta = (np.multiply.reduceat(_factors(snapshot.mensual), inicios) - 1) * 100
+
+        return IPCSnapshot(
+            snapshot.version,
+            _period_labels(anios[inicios], trimestres[inicios], freq),
+            snapshot.fechas[inicios],
+            np.round(compuesta, DERIVED_DIGITS),
+            snapshot.anual[finales],
+        )
+
+    return _memoized(snapshot, ('resample', freq), calcular, clave)
@@ -0,0 +1,80 @@
+"""
+Plan de ejecución de las consultas más usadas sobre los datos IPC
+
+    python manage.py explain_ipc_queries
+    python manage.py explain_ipc_queries -v 2 --analyze
+"""
+
+import re
+from datetime import date
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from ipc.models import IPCData, Observacion, EstadisticasSerie
+from ipc.exports import EXPORT_FIELDS
+
+# Marcas de uso de índice en la salida de EXPLAIN (SQLite y PostgreSQL)
+INDEX_PATTERN = re.compile(r'USING (COVERING )?INDEX|USING (INTEGER )?PRIMARY KEY|Index (Only )?Scan|Bitmap Index Scan', re.IGNORECASE)
+SORT_PATTERN = re.compile(r'TEMP B-TREE|\bSort\b')
+
+
+def hot_queries():
+    """
+    (nombre, queryset) de cada consulta que usan las vistas y el loader
+    """
+    hoy = date.today()
+    desde = date(hoy.year - 5, 1, 1)
+
+    return [
+        ('Más recientes [:24] (ordering por defecto)', IPCData.objects.order_by('-fecha')[:24]),
+        ('first() / más reciente', IPCData.objects.order_by('-fecha')[:1]),
+        ('last() / más antiguo', IPCData.objects.order_by('fecha')[:1]),
+        ('Copia en memoria (serie completa)', IPCData.objects.order_by('fecha').values_list(*EXPORT_FIELDS)),
+        ('Rango de fechas (consulta / export)', IPCData.objects.filter(fecha__gte=desde, fecha__lte=hoy).order_by('fecha').values_list(*EXPORT_FIELDS)),
+        ('Página keyset desc', IPCData.objects.filter(Q(fecha__lt=hoy) | Q(fecha=hoy, pk__lt=0)).order_by('-fecha', '-pk')[:101]),
+        ('Loader: existentes por período', IPCData.objects.filter(periodo__in=['ene.2024', 'feb.2024']).order_by().values_list('id', 'periodo')),
+        ('Observaciones: últimos 24 de una serie', Observacion.objects.filter(serie_id=1).order_by('-fecha')[:24]),
+        ('Versión de los datos por clave', EstadisticasSerie.objects.filter(pk='chile.ipc')),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta EXPLAIN sobre las consultas frecuentes e indica si usan índice'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Ejecutar las consultas (EXPLAIN ANALYZE, solo PostgreSQL)'
+        )
+
+    def handle(self, *args, **options):
+        analyze = options['analyze'] and connection.vendor == 'postgresql'
+        verbosity = options['verbosity']
+
+        self.stdout.write(f"🔎 Planes de ejecución ({connection.vendor})\n")
+
+        sin_indice = 0
+        for nombre, queryset in hot_queries():
+            plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+
+            usa_indice = bool(INDEX_PATTERN.search(plan))
+            ordena = bool(SORT_PATTERN.search(plan))
+
+            if usa_indice:
+                estado = self.style.SUCCESS('✅ usa índice')
+            else:
+                estado = self.style.WARNING('⚠️  sin índice')
+                sin_indice += 1
+            if ordena:
+                estado += self.style.WARNING(' (ordena en memoria)')
+
+            self.stdout.write(f"{estado}  {nombre}")
+            if verbosity >= 2:
+                self.stdout.write('    ' + plan.replace('\n', '\n    ') + '\n')
+
+        if sin_indice:
+            self.stdout.write(
+                f"\n💡 {sin_indice} consulta(s) sin índice. En tablas chicas PostgreSQL "
+                "puede preferir un Seq Scan aunque el índice exista."
+            )
@@ -0,0 +1,269 @@
+"""
+Carga en paralelo todas las fuentes de settings.PARQUET_FILES
+
+    python manage.py load_ipc_sources
+    python manage.py load_ipc_sources --workers 8 --db-workers 2 --incremental
+    python manage.py load_ipc_sources --only chile/ipc
+
+La lectura y el parseo (CPU) corren en un pool de procesos, sin tocar la
+base de datos, y dejan los lotes en un Parquet temporal. Las escrituras
+pasan por un pool de a lo más --db-workers hilos, cada uno con su propia
+conexión, y empiezan apenas termina el parseo de cada fuente. Una
+fuente con error no detiene a las demás.
+
+Solo chile/ipc se escribe en IPCData (una sola serie, sin país ni tipo en
+la clave); las demás fuentes se guardan solo en Serie/Observacion.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import django
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from ipc.data_loader import IPCDataLoader
+from ipc.dataset import PARQUET_COMPRESSION
+
+
+def init_worker(log_level):
+    """
+    Configura Django en cada proceso de parseo, con el mismo nivel de log
+    que el comando
+    """
+    django.setup()
+    logging.getLogger('ipc').setLevel(log_level)
+
+
+# Lotes ya parseados, tal como los deja IPCDataLoader.read_frames
+PARSED_SCHEMA = pa.schema([
+    ('periodo', pa.string()),
+    ('fecha', pa.timestamp('s')),
+    ('variacion_mensual', pa.float64()),
+    ('variacion_anual', pa.float64()),
+])
+
+
+def parse_source(country, data_type, chunk_size):
+    """
+    Lee y parsea una fuente en un proceso de trabajo
+
+    Cada lote parseado se escribe como un row group de un Parquet
+    temporal: al proceso principal solo vuelve la ruta, y la memoria
+    usada no crece con el tamaño de la fuente.
+
+    Returns:
+        tuple: (ruta del Parquet temporal, filas descartadas, segundos)
+    """
+    inicio = time.perf_counter()
+
+    frames = IPCDataLoader(country, data_type).read_frames(chunk_size)
+    if frames is None:
+        raise ValueError('faltan columnas esperadas en la fuente')
+
+    descriptor, ruta = tempfile.mkstemp(prefix=f'ipc-{country}-{data_type}-', suffix='.parquet')
+    os.close(descriptor)
+
+    descartadas = 0
+    try:
+        with pq.ParquetWriter(ruta, PARSED_SCHEMA, compression=PARQUET_COMPRESSION) as writer:
+            for registros, error_count in frames:
+                descartadas += error_count
+                if len(registros):
+                    writer.write_table(pa.Table.from_pandas(registros, schema=PARSED_SCHEMA, preserve_index=False))
+    except BaseException:
+        os.remove(ruta)
+        raise
+
+    return ruta, descartadas, time.perf_counter() - inicio
+
+
+def read_parsed(ruta, descartadas):
+    """
+    Lotes de un Parquet de parse_source, un row group a la vez, con la
+    forma de read_frames (las filas descartadas van en el primero)
+    """
+    with pq.ParquetFile(ruta) as archivo:
+        for numero in range(archivo.num_row_groups):
+            registros = archivo.read_row_group(numero).to_pandas()
+            registros['periodo'] = registros['periodo'].astype('string')
+            yield registros, descartadas
+            descartadas = 0
+
+    if descartadas:
+        yield PARSED_SCHEMA.empty_table().to_pandas(), descartadas
+
+
+def write_source(country, data_type, ruta, descartadas, batch_size):
+    """
+    Escribe los lotes de una fuente desde un hilo del pool de escritura y
+    borra su Parquet temporal
+
+    Returns:
+        tuple: (resultado de write_frames, segundos)
+    """
+    inicio = time.perf_counter()
+    try:
+        frames = read_parsed(ruta, descartadas)
+        resultado = IPCDataLoader(country, data_type).write_frames(frames, batch_size=batch_size)
+    finally:
+        os.remove(ruta)
+        # Conexión propia del hilo: se cierra para no acumular conexiones
+        connection.close()
+
+    return resultado, time.perf_counter() - inicio
+
+
+class Command(BaseCommand):
+    help = 'Carga todas las fuentes configuradas: parseo en procesos, escritura con conexiones acotadas'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Procesos de parseo (por defecto, uno por CPU)'
+        )
+        parser.add_argument(
+            '--db-workers',
+            type=int,
+            default=None,
+            help='Escrituras simultáneas en la base de datos (por defecto 1 en SQLite, 4 en otros motores)'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Omitir las fuentes que no cambiaron desde la última carga'
+        )
+        parser.add_argument(
+            '--only',
+            nargs='+',
+            metavar='PAIS/TIPO',
+            help='Cargar solo estas fuentes'
+        )
+        parser.add_argument('--chunk-size', type=int, default=None, help='Filas leídas por lote')
+        parser.add_argument('--batch-size', type=int, default=None, help='Filas por lote de escritura')
+
+    def handle(self, *args, **options):
+        # Avance de la carga (📁, 📊, 🎉) salvo con --verbosity 0
+        if options['verbosity'] > 0:
+            logging.getLogger('ipc').setLevel(settings.IPC_LOG_LEVEL)
+
+        fuentes = [
+            (pais, tipo)
+            for pais, tipos in settings.PARQUET_FILES.items()
+            for tipo in tipos
+        ]
+        if options['only']:
+            fuentes = [(pais, tipo) for pais, tipo in fuentes if f"{pais}/{tipo}" in options['only']]
+        if not fuentes:
+            raise CommandError('No hay fuentes configuradas para cargar')
+
+        workers = options['workers'] or os.cpu_count()
+        # SQLite serializa las escrituras: más hilos solo esperarían el lock
+        db_workers = options['db_workers'] or (1 if connection.vendor == 'sqlite' else 4)
+
+        inicio = time.perf_counter()
+        resultados = {}
+        pendientes = []
+
+        for pais, tipo in fuentes:
+            clave = f"{pais}/{tipo}"
+            if not options['incremental']:
+                pendientes.append((pais, tipo))
+                continue
+            try:
+                omitida = IPCDataLoader(pais, tipo).unchanged_result()
+            except Exception as e:
+                self._report(resultados, clave, error=e)
+                continue
+            if omitida is None:
+                pendientes.append((pais, tipo))
+            else:
+                self._report(resultados, clave, resultado=omitida)
+
+        if pendientes:
+            self.stdout.write(
+                f"🔄 Cargando {len(pendientes)} fuente(s): {min(workers, len(pendientes))} proceso(s) de parseo, "
+                f"{db_workers} escritor(es)"
+            )
+            self._load(pendientes, workers, db_workers, options, resultados)
+
+        self._summary(resultados, time.perf_counter() - inicio)
+
+        errores = [clave for clave, fila in resultados.items() if fila['error']]
+        if errores:
+            raise CommandError(f"{len(errores)} fuente(s) con error: {', '.join(errores)}")
+
+    def _load(self, pendientes, workers, db_workers, options, resultados):
+        # Los procesos hijos no deben heredar conexiones abiertas
+        connections.close_all()
+
+        procesos = ProcessPoolExecutor(
+            max_workers=min(workers, len(pendientes)),
+            initializer=init_worker,
+            initargs=(logging.getLogger('ipc').level,),
+        )
+        with procesos, ThreadPoolExecutor(max_workers=db_workers) as escritores:
+            parseos = {
+                procesos.submit(parse_source, pais, tipo, options['chunk_size']): (pais, tipo)
+                for pais, tipo in pendientes
+            }
+            escrituras = {}
+
+            # Cada fuente pasa a escritura en cuanto termina su parseo
+            for futuro in as_completed(parseos):
+                pais, tipo = parseos[futuro]
+                try:
+                    ruta, descartadas, segundos_parseo = futuro.result()
+                except Exception as e:
+                    self._report(resultados, f"{pais}/{tipo}", error=e)
+                    continue
+
+                escrituras[escritores.submit(write_source, pais, tipo, ruta, descartadas, options['batch_size'])] = (
+                    f"{pais}/{tipo}", segundos_parseo
+                )
+
+            for futuro in as_completed(escrituras):
+                clave, segundos_parseo = escrituras[futuro]
+                try:
+                    resultado, segundos_escritura = futuro.result()
+                except Exception as e:
+                    self._report(resultados, clave, error=e, parseo=segundos_parseo)
+                    continue
+                self._report(resultados, clave, resultado, parseo=segundos_parseo, escritura=segundos_escritura)
+
+    def _report(self, resultados, clave, resultado=None, error=None, parseo=None, escritura=None):
+        resultados[clave] = {'resultado': resultado, 'error': error, 'parseo': parseo, 'escritura': escritura}
+
+        if error is not None:
+            self.stdout.write(self.style.ERROR(f"❌ {clave}: {error}"))
+        elif resultado['skipped']:
+            self.stdout.write(f"⏭️  {clave}: sin cambios")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {clave}: {resultado['created']} creados, {resultado['updated']} actualizados, "
+                f"{resultado['unchanged']} sin cambios, {resultado['errors']} descartados"
+            ))
+
+    def _summary(self, resultados, total):
+        def ms(segundos):
+            return '-' if segundos is None else f"{segundos * 1000:.0f}ms"
+
+        self.stdout.write(f"\n{'Fuente':<24} {'Estado':<12} {'Parseo':>10} {'Escritura':>10}")
+        self.stdout.write('-' * 59)
+        for clave, fila in sorted(resultados.items()):
+            if fila['error'] is not None:
+                estado = 'error'
+            elif fila['resultado']['skipped']:
+                estado = 'sin cambios'
+            else:
+                estado = 'cargada'
+            self.stdout.write(f"{clave:<24} {estado:<12} {ms(fila['parseo']):>10} {ms(fila['escritura']):>10}")
+
+        errores = sum(1 for fila in resultados.values() if fila['error'] is not None)
+        self.stdout.write(f"\n🎉 {len(resultados) - errores} fuente(s) OK, {errores} con error ({total:.1f}s)")
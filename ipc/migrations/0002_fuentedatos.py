@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipc', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FuenteDatos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pais', models.CharField(max_length=50, verbose_name='País')),
+                ('tipo_dato', models.CharField(max_length=50, verbose_name='Tipo de dato')),
+                ('ruta', models.CharField(max_length=500, verbose_name='Ruta del archivo')),
+                ('mtime', models.FloatField(blank=True, null=True, verbose_name='Fecha de modificación (epoch)')),
+                ('tamano', models.BigIntegerField(blank=True, null=True, verbose_name='Tamaño (bytes)')),
+                ('hash_contenido', models.CharField(blank=True, max_length=64, verbose_name='Hash SHA-256')),
+                ('ultima_fecha', models.DateField(blank=True, null=True, verbose_name='Última fecha cargada')),
+                ('filas', models.PositiveIntegerField(default=0, verbose_name='Filas en la última carga')),
+                ('cargado_en', models.DateTimeField(auto_now=True, verbose_name='Última carga')),
+            ],
+            options={
+                'verbose_name': 'Fuente de datos',
+                'verbose_name_plural': 'Fuentes de datos',
+                'constraints': [models.UniqueConstraint(fields=('pais', 'tipo_dato'), name='ipc_fuentedatos_pais_tipo_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipc', '0002_fuentedatos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Serie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codigo', models.CharField(max_length=150, unique=True, verbose_name='Código')),
+                ('pais', models.CharField(max_length=50, verbose_name='País')),
+                ('indicador', models.CharField(max_length=100, verbose_name='Indicador')),
+                ('nombre', models.CharField(blank=True, max_length=200, verbose_name='Nombre')),
+                ('frecuencia', models.CharField(choices=[('D', 'Diaria'), ('M', 'Mensual'), ('Q', 'Trimestral'), ('Y', 'Anual')], default='M', max_length=1, verbose_name='Frecuencia')),
+                ('unidad', models.CharField(blank=True, max_length=30, verbose_name='Unidad')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Serie',
+                'verbose_name_plural': 'Series',
+                'ordering': ['codigo'],
+                'constraints': [models.UniqueConstraint(fields=('pais', 'indicador'), name='ipc_serie_pais_indicador_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Observacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('valor', models.DecimalField(decimal_places=6, max_digits=20, verbose_name='Valor')),
+                ('serie', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='observaciones', to='ipc.serie')),
+            ],
+            options={
+                'verbose_name': 'Observación',
+                'verbose_name_plural': 'Observaciones',
+                'ordering': ['serie', '-fecha'],
+                'constraints': [models.UniqueConstraint(fields=('serie', 'fecha'), name='ipc_observacion_serie_fecha_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipc', '0003_series_observaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticasSerie',
+            fields=[
+                ('clave', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Clave')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Versión de los datos')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+            ],
+            options={
+                'verbose_name': 'Versión de serie',
+                'verbose_name_plural': 'Versiones de series',
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipc', '0004_estadisticasserie'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ipcdata',
+            index=models.Index(fields=['fecha'], include=['periodo', 'variacion_mensual', 'variacion_anual'], name='ipc_ipcdata_fecha_cover_idx'),
+        ),
+    ]
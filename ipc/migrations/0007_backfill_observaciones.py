@@ -0,0 +1,50 @@
+from django.db import migrations
+
+# Copia de IPCDataLoader.SERIES al momento de esta migración
+SERIES = {
+    'variacion_mensual': {'nombre': 'Variación Mensual (%)', 'frecuencia': 'M', 'unidad': '%'},
+    'variacion_anual': {'nombre': 'Variación Anual (%)', 'frecuencia': 'M', 'unidad': '%'},
+}
+
+
+def backfill_observaciones(apps, schema_editor):
+    """
+    Copia el histórico de IPCData a Observacion: el loader solo replica
+    filas nuevas o modificadas, así que los datos cargados antes de
+    0003 nunca llegarían a las series
+    """
+    IPCData = apps.get_model('ipc', 'IPCData')
+    Serie = apps.get_model('ipc', 'Serie')
+    Observacion = apps.get_model('ipc', 'Observacion')
+
+    filas = IPCData.objects.order_by('fecha').values_list('fecha', *SERIES)
+    if not filas.exists():
+        return
+
+    for posicion, (columna, meta) in enumerate(SERIES.items(), start=1):
+        indicador = f'ipc.{columna}'
+        serie, _ = Serie.objects.get_or_create(
+            pais='chile',
+            indicador=indicador,
+            defaults={'codigo': f'chile.{indicador}', **meta}
+        )
+
+        # Una observación por fecha; las que ya existen no se tocan
+        existentes = set(Observacion.objects.filter(serie=serie).values_list('fecha', flat=True))
+        valores = {fila[0]: fila[posicion] for fila in filas if fila[0] not in existentes}
+
+        Observacion.objects.bulk_create(
+            [Observacion(serie=serie, fecha=fecha, valor=valor) for fecha, valor in valores.items()],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipc', '0006_ipcdata_fecha_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_observaciones, migrations.RunPython.noop),
+    ]
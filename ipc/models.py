@@ -1,6 +1,7 @@
 from django.db import models
 from datetime import datetime
 import pandas as pd
+from .parsing import MESES_NOMBRES, MESES_NUMEROS
 
 class IPCData(models.Model):
     periodo = models.CharField(max_length=20, unique=True, verbose_name="Período")
@@ -22,23 +23,37 @@ class IPCData(models.Model):
         verbose_name = "Dato IPC"
         verbose_name_plural = "Datos IPC"
         ordering = ['-fecha']
+        indexes = [
+            # Rangos y orden por fecha en ambos sentidos (snapshot, exports,
+            # consultas por rango, [:N] más recientes). En PostgreSQL INCLUDE
+            # lo vuelve cubriente (index-only scan); en SQLite Django lo omite
+            models.Index(
+                fields=['fecha'],
+                include=['periodo', 'variacion_mensual', 'variacion_anual'],
+                name='ipc_ipcdata_fecha_cover_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.periodo} - Mensual: {self.variacion_mensual}% - Anual: {self.variacion_anual}%"
     
+    @classmethod
+    def check(cls, **kwargs):
+        # Sin índices cubrientes (SQLite) el de fecha se crea sin INCLUDE a
+        # propósito: se omite solo el aviso models.W040 de este modelo
+        return [error for error in super().check(**kwargs) if error.id != 'models.W040']
+    
     @classmethod
     def parse_periodo_and_fecha(cls, periodo_value):
         """
         Maneja diferentes formatos de período:
         - 'ene.2011' -> convierte a fecha y periodo
         - '2011-01-01' (fecha) -> convierte a periodo formato 'ene.2011'
+
+        Para columnas completas usar ipc.parsing.parse_periodo_column.
         """
-        meses_nombres = {
-            1: 'ene', 2: 'feb', 3: 'mar', 4: 'abr', 5: 'may', 6: 'jun',
-            7: 'jul', 8: 'ago', 9: 'sep', 10: 'oct', 11: 'nov', 12: 'dic'
-        }
-        
-        meses_numeros = {v: k for k, v in meses_nombres.items()}
+        meses_nombres = MESES_NOMBRES
+        meses_numeros = MESES_NUMEROS
         
         try:
             # Si es un string como 'ene.2011'
@@ -79,4 +94,111 @@ class IPCData(models.Model):
         except Exception as e:
             print(f"Error parseando periodo: {periodo_value} -> {e}")
         
-        return None, None
\ No newline at end of file
+        return None, None
+
+class FuenteDatos(models.Model):
+    """
+    Marca de agua por archivo fuente (país + tipo de dato) para la carga incremental
+    """
+    pais = models.CharField(max_length=50, verbose_name="País")
+    tipo_dato = models.CharField(max_length=50, verbose_name="Tipo de dato")
+    ruta = models.CharField(max_length=500, verbose_name="Ruta del archivo")
+    mtime = models.FloatField(null=True, blank=True, verbose_name="Fecha de modificación (epoch)")
+    tamano = models.BigIntegerField(null=True, blank=True, verbose_name="Tamaño (bytes)")
+    hash_contenido = models.CharField(max_length=64, blank=True, verbose_name="Hash SHA-256")
+    ultima_fecha = models.DateField(null=True, blank=True, verbose_name="Última fecha cargada")
+    filas = models.PositiveIntegerField(default=0, verbose_name="Filas en la última carga")
+    cargado_en = models.DateTimeField(auto_now=True, verbose_name="Última carga")
+    
+    class Meta:
+        verbose_name = "Fuente de datos"
+        verbose_name_plural = "Fuentes de datos"
+        constraints = [
+            models.UniqueConstraint(fields=['pais', 'tipo_dato'], name='ipc_fuentedatos_pais_tipo_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.pais}/{self.tipo_dato} - {self.ultima_fecha}"
+
+
+class Serie(models.Model):
+    """
+    Catálogo de series de tiempo (una fila por indicador)
+    """
+    FRECUENCIAS = [
+        ('D', 'Diaria'),
+        ('M', 'Mensual'),
+        ('Q', 'Trimestral'),
+        ('Y', 'Anual'),
+    ]
+    
+    codigo = models.CharField(max_length=150, unique=True, verbose_name="Código")
+    pais = models.CharField(max_length=50, verbose_name="País")
+    indicador = models.CharField(max_length=100, verbose_name="Indicador")
+    nombre = models.CharField(max_length=200, blank=True, verbose_name="Nombre")
+    frecuencia = models.CharField(max_length=1, choices=FRECUENCIAS, default='M', verbose_name="Frecuencia")
+    unidad = models.CharField(max_length=30, blank=True, verbose_name="Unidad")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Serie"
+        verbose_name_plural = "Series"
+        ordering = ['codigo']
+        constraints = [
+            models.UniqueConstraint(fields=['pais', 'indicador'], name='ipc_serie_pais_indicador_uniq'),
+        ]
+    
+    def __str__(self):
+        return self.codigo
+    
+    @staticmethod
+    def build_codigo(pais, indicador):
+        """
+        Código estable de la serie: 'chile.ipc.variacion_mensual'
+        """
+        return f"{pais}.{indicador}"
+
+
+class Observacion(models.Model):
+    """
+    Tabla angosta de observaciones: un valor por (serie, fecha)
+    """
+    # El índice compuesto (serie, fecha) ya cubre las búsquedas por serie
+    serie = models.ForeignKey(Serie, on_delete=models.CASCADE, related_name='observaciones', db_index=False)
+    fecha = models.DateField(verbose_name="Fecha")
+    valor = models.DecimalField(max_digits=20, decimal_places=6, verbose_name="Valor")
+    
+    class Meta:
+        verbose_name = "Observación"
+        verbose_name_plural = "Observaciones"
+        ordering = ['serie', '-fecha']
+        constraints = [
+            # Índice único (serie_id, fecha): "últimos N puntos de X" es un
+            # recorrido de rango sobre este índice
+            models.UniqueConstraint(fields=['serie', 'fecha'], name='ipc_observacion_serie_fecha_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.serie_id} {self.fecha}: {self.valor}"
+
+
+class EstadisticasSerie(models.Model):
+    """
+    Versión de los datos de una serie, incrementada al final de cada carga
+
+    Las estadísticas se calculan sobre la copia en memoria (ipc/snapshot.py),
+    que se recarga cuando cambia esta versión.
+    """
+    clave = models.CharField(max_length=100, primary_key=True, verbose_name="Clave")
+    
+    # Crece en cada carga (milisegundos epoch como mínimo, para no repetir
+    # versiones si el registro se borra); forma parte de las claves de caché
+    version = models.PositiveBigIntegerField(default=0, verbose_name="Versión de los datos")
+    actualizado = models.DateTimeField(auto_now=True, verbose_name="Actualizado")
+    
+    class Meta:
+        verbose_name = "Versión de serie"
+        verbose_name_plural = "Versiones de series"
+    
+    def __str__(self):
+        return f"{self.clave} (v{self.version})"
@@ -0,0 +1,91 @@
+"""
+Parseo vectorizado de columnas de períodos y valores
+
+No depende de Django, así que puede usarse desde scripts y procesos
+de trabajo sin configurar el proyecto.
+"""
+
+import pandas as pd
+
+MESES_NOMBRES = {
+    1: 'ene', 2: 'feb', 3: 'mar', 4: 'abr', 5: 'may', 6: 'jun',
+    7: 'jul', 8: 'ago', 9: 'sep', 10: 'oct', 11: 'nov', 12: 'dic'
+}
+
+MESES_NUMEROS = {v: k for k, v in MESES_NOMBRES.items()}
+
+# 'ene.2011', 'Ene.2011', ...
+_PERIODO_ABREVIADO = r'^([A-Za-z]{3})\.(\d{4})$'
+
+
+def parse_periodo_column(valores):
+    """
+    Versión por columna de IPCData.parse_periodo_and_fecha
+
+    Acepta strings tipo 'ene.2011', Timestamps y strings de fecha ISO
+    ('2011-01-01') mezclados en la misma columna.
+
+    Args:
+        valores (pd.Series): Columna 'Periodo' original
+
+    Returns:
+        tuple: (periodos, fechas, invalidos) alineados con el índice de
+        entrada. `fechas` es datetime64 normalizado al día e `invalidos`
+        es una máscara booleana con las filas que no se pudieron parsear.
+    """
+    valores = pd.Series(valores)
+
+    if pd.api.types.is_datetime64_any_dtype(valores):
+        if valores.dt.tz is not None:
+            valores = valores.dt.tz_localize(None)
+        fechas = valores.astype('datetime64[ns]')
+        texto = pd.Series(pd.NA, index=valores.index, dtype='string')
+        abreviado = pd.Series(False, index=valores.index)
+    else:
+        texto = valores.astype('string').str.strip()
+
+        # Formato 'ene.2011'
+        partes = texto.str.extract(_PERIODO_ABREVIADO)
+        meses = partes[0].str.lower().map(MESES_NUMEROS)
+        abreviado = meses.notna()
+        fechas = pd.to_datetime(
+            partes[1] + '-' + meses.astype('Int64').astype('string').str.zfill(2) + '-01',
+            format='%Y-%m-%d',
+            errors='coerce'
+        )
+
+        # Resto: Timestamps convertidos a texto y strings de fecha ISO
+        resto = ~abreviado & texto.notna()
+        if resto.any():
+            fechas[resto] = pd.to_datetime(texto[resto], errors='coerce', format='ISO8601')
+
+    fechas = fechas.dt.normalize()
+    invalidos = fechas.isna()
+
+    # Periodo en formato 'ene.2011' generado desde la fecha
+    periodos = (
+        fechas.dt.month.map(MESES_NOMBRES).astype('string')
+        + '.'
+        + fechas.dt.year.astype('Int64').astype('string')
+    )
+    # Los 'ene.2011' originales se conservan tal cual
+    periodos = periodos.where(~abreviado, texto)
+    periodos[invalidos] = pd.NA
+
+    return periodos, fechas, invalidos
+
+
+def parse_decimal_column(valores):
+    """
+    Convierte una columna numérica a float64, aceptando coma decimal
+
+    Los valores que no se pueden convertir quedan como NaN.
+    """
+    valores = pd.Series(valores)
+
+    if pd.api.types.is_numeric_dtype(valores):
+        return valores.astype('float64')
+
+    texto = valores.astype('string').str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(texto, errors='coerce').astype('float64')
+
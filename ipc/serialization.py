@@ -0,0 +1,70 @@
+"""
+Serialización JSON de las respuestas de la API
+
+Usa orjson si está instalado (serializa arreglos NumPy directamente) y si
+no la librería estándar. Las partes fijas de una respuesta (estilos de
+Chart.js) se codifican una sola vez y los datos se insertan como bytes.
+"""
+
+import json
+import numpy as np
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional
+    orjson = None
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+def dumps(data):
+    """
+    JSON compacto como bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def encode_array(values):
+    """
+    Arreglo NumPy (o lista) como lista JSON, sin pasar por un float de
+    Python por elemento cuando orjson está disponible
+    """
+    if orjson is not None and isinstance(values, np.ndarray) and values.dtype != object:
+        return orjson.dumps(values, option=orjson.OPT_SERIALIZE_NUMPY)
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind == 'f':
+            # NaN no es JSON válido: se envía como null (igual que orjson)
+            values = np.where(np.isnan(values), None, values)
+        values = values.tolist()
+    return dumps(values)
+
+
+def encode_object(**fields):
+    """
+    Objeto JSON a partir de valores ya codificados (bytes), en orden
+    """
+    return b'{' + b','.join(dumps(name) + b':' + value for name, value in fields.items()) + b'}'
+
+
+class DatasetTemplate:
+    """
+    Dataset de Chart.js con el estilo codificado una vez; render() agrega
+    la clave 'data' con los valores ya codificados
+    """
+
+    def __init__(self, style):
+        # Se quita la llave de cierre para continuar el objeto
+        self._head = dumps(style)[:-1]
+
+    def render(self, data):
+        return self._head + b',"data":' + data + b'}'
+
+
+def json_bytes_response(body, **kwargs):
+    """
+    HttpResponse para un cuerpo JSON ya codificado
+    """
+    return HttpResponse(body, content_type=JSON_CONTENT_TYPE, **kwargs)
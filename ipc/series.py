@@ -0,0 +1,91 @@
+"""
+Escritura y consultas sobre el modelo genérico de series (Serie + Observacion)
+
+Un mismo loader, las mismas consultas y la misma capa de caché sirven para
+cualquier indicador registrado en el catálogo.
+"""
+
+from .models import Serie, Observacion
+
+
+def get_or_create_serie(pais, indicador, **defaults):
+    """
+    Obtiene (o registra) una serie del catálogo
+
+    Args:
+        pais (str): País ('chile', etc.)
+        indicador (str): Indicador ('ipc.variacion_mensual', etc.)
+        **defaults: nombre, frecuencia y unidad para series nuevas
+    """
+    serie, _ = Serie.objects.get_or_create(
+        pais=pais,
+        indicador=indicador,
+        defaults={'codigo': Serie.build_codigo(pais, indicador), **defaults}
+    )
+    return serie
+
+
+def upsert_observaciones(serie, fechas, valores, batch_size=500):
+    """
+    Inserta o actualiza observaciones de una serie con un upsert nativo
+    (INSERT ... ON CONFLICT (serie_id, fecha) DO UPDATE)
+
+    Args:
+        serie (Serie): Serie destino
+        fechas (iterable): Fechas (date) de cada observación
+        valores (iterable): Valores numéricos alineados con fechas
+
+    Returns:
+        int: Observaciones escritas
+    """
+    observaciones = [
+        Observacion(serie=serie, fecha=fecha, valor=valor)
+        for fecha, valor in zip(fechas, valores)
+    ]
+
+    Observacion.objects.bulk_create(
+        observaciones,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['serie', 'fecha'],
+        update_fields=['valor'],
+    )
+
+    return len(observaciones)
+
+
+def ultimos_puntos(serie, n):
+    """
+    Últimos N puntos de la serie en orden cronológico
+
+    Se resuelve con un recorrido descendente del índice (serie_id, fecha)
+    limitado a N filas.
+
+    Returns:
+        list: Tuplas (fecha, valor)
+    """
+    puntos = list(
+        Observacion.objects
+        .filter(serie=serie)
+        .order_by('-fecha')
+        .values_list('fecha', 'valor')[:n]
+    )
+    puntos.reverse()
+    return puntos
+
+
+def rango(serie, desde=None, hasta=None):
+    """
+    Observaciones de la serie entre dos fechas (ambas inclusive)
+
+    Returns:
+        QuerySet: Tuplas (fecha, valor) en orden cronológico
+    """
+    queryset = Observacion.objects.filter(serie=serie)
+
+    if desde is not None:
+        queryset = queryset.filter(fecha__gte=desde)
+    if hasta is not None:
+        queryset = queryset.filter(fecha__lte=hasta)
+
+    return queryset.order_by('fecha').values_list('fecha', 'valor')
@@ -0,0 +1,74 @@
+"""
+Cambios de IPCData fuera del loader, por ejemplo desde el admin: nueva
+versión de los datos (y de las claves de caché) y la misma fila replicada
+en Observacion
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .models import IPCData, Observacion
+from .series import upsert_observaciones
+from .stats import bump_ipc_version
+
+_suspendido = ContextVar('ipc_version_bump_suspendido', default=False)
+
+
+@contextmanager
+def suspend_version_bump():
+    """
+    Desactiva el cambio de versión por fila mientras el loader escribe; el
+    loader la cambia una sola vez al final de la carga y replica él mismo
+    las filas en Observacion
+    """
+    token = _suspendido.set(True)
+    try:
+        yield
+    finally:
+        _suspendido.reset(token)
+
+
+def _ipc_series():
+    # Import local: data_loader importa este módulo
+    from .data_loader import IPCDataLoader
+    return IPCDataLoader().get_series()
+
+
+@receiver(post_save, sender=IPCData)
+@receiver(post_delete, sender=IPCData)
+def ipc_data_changed(sender, **kwargs):
+    if _suspendido.get():
+        return
+    transaction.on_commit(bump_ipc_version)
+
+
+@receiver(pre_save, sender=IPCData)
+def remember_fecha(sender, instance, **kwargs):
+    # Fecha antes del cambio, para mover la observación si cambia
+    if _suspendido.get() or instance.pk is None:
+        instance._fecha_anterior = None
+        return
+    instance._fecha_anterior = sender.objects.filter(pk=instance.pk).values_list('fecha', flat=True).first()
+
+
+@receiver(post_save, sender=IPCData)
+def mirror_save(sender, instance, **kwargs):
+    if _suspendido.get():
+        return
+
+    series = _ipc_series()
+    anterior = getattr(instance, '_fecha_anterior', None)
+    if anterior is not None and anterior != instance.fecha:
+        Observacion.objects.filter(serie__in=series.values(), fecha=anterior).delete()
+
+    for columna, serie in series.items():
+        upsert_observaciones(serie, [instance.fecha], [getattr(instance, columna)])
+
+
+@receiver(post_delete, sender=IPCData)
+def mirror_delete(sender, instance, **kwargs):
+    if _suspendido.get():
+        return
+    Observacion.objects.filter(serie__in=_ipc_series().values(), fecha=instance.fecha).delete()
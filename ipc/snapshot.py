@@ -0,0 +1,299 @@
+"""
+Copia columnar en memoria de la serie IPC para las lecturas
+
+Cada proceso carga la serie una vez (un arreglo NumPy de fechas y dos de
+variaciones) y la reemplaza cuando cambia la versión de los datos. Los
+gráficos, estadísticas y tablas se sacan por cortes de arreglos, sin ir a
+la base de datos ni armar un objeto por fila.
+
+La copia es de solo lectura: los arreglos no se modifican después de
+cargarlos, así que varios hilos pueden compartirla sin bloqueo.
+
+Con settings.IPC_READ_BACKEND = 'parquet' la copia se arma directamente
+desde los archivos Parquet (memory map) y no se usa la base de datos.
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from asgiref.sync import sync_to_async
+from .caching import aget_data_version, get_data_version, reads_from_parquet
+from .coalescing import coalesced
+from .data_loader import IPCDataLoader
+from .models import IPCData
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+class IPCSnapshot:
+    """
+    Serie IPC en orden cronológico como arreglos paralelos
+
+    ids (claves primarias) solo existe en la serie original, no en las
+    series agregadas.
+    """
+
+    __slots__ = ('version', 'periodos', 'fechas', 'mensual', 'anual', 'ids')
+
+    def __init__(self, version, periodos, fechas, mensual, anual, ids=None):
+        self.version = version
+        self.periodos = periodos
+        self.fechas = fechas
+        self.mensual = mensual
+        self.anual = anual
+        self.ids = ids
+
+        for arreglo in (periodos, fechas, mensual, anual, ids):
+            if arreglo is not None:
+                arreglo.flags.writeable = False
+
+    # Columnas leídas de IPCData, en el orden de from_rows
+    DB_FIELDS = ('periodo', 'fecha', 'variacion_mensual', 'variacion_anual', 'id')
+
+    @classmethod
+    def from_db(cls, version):
+        """
+        Lee la serie completa con una consulta
+        """
+        return cls.from_rows(version, list(IPCData.objects.order_by('fecha').values_list(*cls.DB_FIELDS)))
+
+    @classmethod
+    async def afrom_db(cls, version):
+        """
+        Versión async de from_db (iteración async del ORM)
+        """
+        filas = [fila async for fila in IPCData.objects.order_by('fecha').values_list(*cls.DB_FIELDS)]
+        return cls.from_rows(version, filas)
+
+    @classmethod
+    def from_rows(cls, version, filas):
+        """
+        Serie a partir de filas (periodo, fecha, mensual, anual, id) en
+        orden cronológico
+        """
+        periodos, fechas, mensual, anual, ids = zip(*filas) if filas else ((), (), (), (), ())
+
+        return cls(
+            version,
+            np.array(periodos, dtype=object),
+            np.array(fechas, dtype='datetime64[D]'),
+            np.array(mensual, dtype=np.float64),
+            np.array(anual, dtype=np.float64),
+            np.array(ids, dtype=np.int64),
+        )
+
+    @classmethod
+    def from_parquet(cls, version, clave='chile.ipc'):
+        """
+        Lee la serie desde su fuente en settings.PARQUET_FILES (archivo o
+        dataset particionado), con memory map y el mismo parseo que la
+        carga, así que los valores coinciden con los de IPCData
+
+        Sin claves primarias, ids es la posición de cada mes en la serie.
+        Si la fuente no existe o no tiene las columnas esperadas la serie
+        queda vacía.
+        """
+        pais, tipo_dato = clave.split('.', 1)
+        loader = IPCDataLoader(pais, tipo_dato)
+
+        try:
+            frames = loader.read_frames(memory_map=True)
+            lotes = [registros for registros, _ in frames] if frames is not None else []
+        except FileNotFoundError:
+            lotes = []
+
+        columnas = ['periodo', 'fecha', 'variacion_mensual', 'variacion_anual']
+        registros = pd.concat(lotes) if lotes else pd.DataFrame(columns=columnas)
+
+        # Entre lotes también gana la última fila, igual que en la carga
+        registros = registros.drop_duplicates(subset='periodo', keep='last')
+        registros = registros.drop_duplicates(subset='fecha', keep='last').sort_values('fecha')
+
+        return cls(
+            version,
+            registros['periodo'].to_numpy(dtype=object),
+            registros['fecha'].to_numpy(dtype='datetime64[D]'),
+            registros['variacion_mensual'].to_numpy(dtype=np.float64),
+            registros['variacion_anual'].to_numpy(dtype=np.float64),
+            np.arange(1, len(registros) + 1, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.fechas)
+
+    def _slice(self, corte):
+        # Los cortes de NumPy son vistas: no copian los datos
+        return IPCSnapshot(
+            self.version,
+            self.periodos[corte],
+            self.fechas[corte],
+            self.mensual[corte],
+            self.anual[corte],
+            None if self.ids is None else self.ids[corte],
+        )
+
+    def tail(self, n):
+        """
+        Últimos n meses (todos si n es None)
+        """
+        if n is None:
+            return self
+        return self._slice(slice(max(len(self) - n, 0), None))
+
+    def bounds(self, desde=None, hasta=None):
+        """
+        Índices (inicio, fin) de los meses entre dos fechas (ambas
+        inclusive), por búsqueda binaria
+        """
+        inicio = 0 if desde is None else int(np.searchsorted(self.fechas, np.datetime64(desde, 'D'), side='left'))
+        fin = len(self) if hasta is None else int(np.searchsorted(self.fechas, np.datetime64(hasta, 'D'), side='right'))
+        return inicio, fin
+
+    def page(self, limit, desde=None, hasta=None, after=None, descending=False):
+        """
+        Hasta limit meses entre dos fechas (ambas inclusive), continuando
+        después de la fecha after en el orden pedido (paginación keyset;
+        las fechas de la serie no se repiten)
+
+        Returns:
+            tuple: (IPCSnapshot en orden cronológico, hay más meses)
+        """
+        inicio, fin = self.bounds(desde, hasta)
+
+        if after is not None:
+            if descending:
+                fin = min(fin, self.bounds(desde=after)[0])
+            else:
+                inicio = max(inicio, self.bounds(hasta=after)[1])
+        fin = max(fin, inicio)
+
+        if descending:
+            corte = slice(max(inicio, fin - limit), fin)
+        else:
+            corte = slice(inicio, min(fin, inicio + limit))
+
+        return self._slice(corte), fin - inicio > limit
+
+    def records(self):
+        """
+        Filas como diccionarios (para tablas en plantillas)
+        """
+        return [
+            {'periodo': periodo, 'fecha': fecha, 'variacion_mensual': mensual, 'variacion_anual': anual}
+            for periodo, fecha, mensual, anual in zip(
+                self.periodos.tolist(), self.fechas.tolist(), self.mensual.tolist(), self.anual.tolist()
+            )
+        ]
+
+    @property
+    def latest_record(self):
+        """
+        Último dato (mismos atributos que usa la plantilla de IPCData), o
+        None si no hay datos
+        """
+        return self.tail(1).records()[0] if len(self) else None
+
+    @property
+    def oldest_record(self):
+        return self._slice(slice(0, 1)).records()[0] if len(self) else None
+
+    def summary(self):
+        """
+        Respuesta de api_ipc_summary, o None si no hay datos
+        """
+        if not len(self):
+            return None
+
+        ultimos = self.tail(12)
+        acumulada = (np.prod(1 + ultimos.mensual / 100) - 1) * 100
+
+        return {
+            'total_records': len(self),
+            'date_range': {
+                'start': self.periodos[0],
+                'end': self.periodos[-1]
+            },
+            'latest': {
+                'periodo': self.periodos[-1],
+                'mensual': float(self.mensual[-1]),
+                'anual': float(self.anual[-1])
+            },
+            'statistics': {
+                'mensual': {
+                    'promedio': round(float(self.mensual.mean()), 2),
+                    'maximo': float(self.mensual.max()),
+                    'minimo': float(self.mensual.min())
+                },
+                'anual': {
+                    'promedio': round(float(self.anual.mean()), 2),
+                    'maximo': float(self.anual.max()),
+                    'minimo': float(self.anual.min())
+                }
+            },
+            'last_12_months': {
+                'mensual': {
+                    'acumulada': round(float(acumulada), 2),
+                    'promedio': round(float(ultimos.mensual.mean()), 2)
+                },
+                'anual': {
+                    'promedio': round(float(ultimos.anual.mean()), 2),
+                    'maximo': round(float(ultimos.anual.max()), 2),
+                    'minimo': round(float(ultimos.anual.min()), 2)
+                }
+            }
+        }
+
+
+def get_snapshot(clave='chile.ipc'):
+    """
+    Copia en memoria de la versión actual de los datos
+
+    Mientras la versión no cambie no se consulta la base de datos (la
+    versión viene de la caché). Al cambiar, un solo hilo recarga la serie
+    y reemplaza la referencia; los que ya tenían la anterior la siguen
+    usando sin problema.
+    """
+    version = get_data_version(clave)
+
+    snapshot = _snapshots.get(clave)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _snapshots.get(clave)
+        if snapshot is None or snapshot.version != version:
+            if reads_from_parquet():
+                snapshot = IPCSnapshot.from_parquet(version, clave)
+            else:
+                snapshot = IPCSnapshot.from_db(version)
+            _snapshots[clave] = snapshot
+
+    return snapshot
+
+
+async def aget_snapshot(clave='chile.ipc'):
+    """
+    Versión async de get_snapshot
+
+    Al cambiar la versión, las requests concurrentes del mismo proceso
+    esperan una sola recarga (ORM async, o un hilo para leer los archivos
+    en el backend 'parquet').
+    """
+    version = await aget_data_version(clave)
+
+    snapshot = _snapshots.get(clave)
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    async def cargar():
+        if reads_from_parquet():
+            snapshot = await sync_to_async(IPCSnapshot.from_parquet, thread_sensitive=False)(version, clave)
+        else:
+            snapshot = await IPCSnapshot.afrom_db(version)
+
+        with _lock:
+            _snapshots[clave] = snapshot
+        return snapshot
+
+    return await coalesced(('snapshot', clave, version), cargar)
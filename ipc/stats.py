@@ -0,0 +1,46 @@
+"""
+Versión de los datos IPC
+
+EstadisticasSerie guarda la versión de la serie: cada carga (o cambio en
+IPCData) la incrementa, y las claves de caché, el ETag y la copia en
+memoria (ipc/snapshot.py) dependen de ella. Las estadísticas del resumen
+se calculan sobre la copia en memoria.
+"""
+
+import time
+from django.db import transaction
+from .models import EstadisticasSerie
+from .caching import publish_data_version
+
+# Clave de EstadisticasSerie de la única serie que guarda IPCData. La tabla
+# no tiene columna de serie, así que su versión solo vale para esta.
+IPC_KEY = 'chile.ipc'
+
+
+def has_ipc_version():
+    """
+    True si la serie ya tiene una versión registrada (una búsqueda por
+    clave primaria)
+    """
+    return EstadisticasSerie.objects.filter(pk=IPC_KEY).exists()
+
+
+def bump_ipc_version():
+    """
+    Incrementa la versión de los datos y la publica en la caché al hacer
+    commit
+
+    La versión son los milisegundos epoch del cambio (como mínimo la
+    anterior + 1), así que sirve también como Last-Modified.
+
+    Returns:
+        int: Nueva versión
+    """
+    with transaction.atomic():
+        anterior = EstadisticasSerie.objects.select_for_update().filter(pk=IPC_KEY).first()
+        version = max(anterior.version + 1 if anterior else 0, int(time.time() * 1000))
+
+        EstadisticasSerie.objects.update_or_create(clave=IPC_KEY, defaults={'version': version})
+        publish_data_version(IPC_KEY, version)
+
+    return version
@@ -1,3 +1,856 @@
-from django.test import TestCase
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+from convert_to_parquet import STATE_FILE, build_dataset
+from .artifacts import artifact_path, build_artifacts
+from .cached import acached, cached
+from .coalescing import coalesced
+from .data_loader import IPCDataLoader
+from .downsampling import MIN_POINTS, downsample_indices, lttb_indices, minmax_indices
+from .indicators import annualized_rate, cumulative_inflation, price_index, resample, rolling_mean
+from .management.commands.load_ipc_sources import parse_source, read_parsed
+from .models import EstadisticasSerie, FuenteDatos, IPCData, Serie
+from .parsing import parse_decimal_column, parse_periodo_column
+from .snapshot import IPCSnapshot, _snapshots
+from .stats import IPC_KEY, bump_ipc_version
 
-# Create your tests here.
+
+class ParsingTests(SimpleTestCase):
+
+    def test_parse_periodo_column_mixed(self):
+        valores = pd.Series(['ene.2011', 'Feb.2011', pd.Timestamp('2011-03-01'), '2011-04-01', 'xyz', None], dtype=object)
+
+        periodos, fechas, invalidos = parse_periodo_column(valores)
+
+        self.assertEqual(periodos[:4].tolist(), ['ene.2011', 'Feb.2011', 'mar.2011', 'abr.2011'])
+        self.assertEqual(
+            fechas[:4].dt.date.tolist(),
+            [date(2011, 1, 1), date(2011, 2, 1), date(2011, 3, 1), date(2011, 4, 1)]
+        )
+        self.assertEqual(invalidos.tolist(), [False, False, False, False, True, True])
+        self.assertTrue(periodos[4:].isna().all())
+
+    def test_parse_decimal_column(self):
+        self.assertEqual(parse_decimal_column(pd.Series([1, 2])).dtype, 'float64')
+
+        valores = parse_decimal_column(pd.Series(['0,3', ' 1.25 ', 'n/d', None], dtype=object))
+        self.assertEqual(valores[:2].tolist(), [0.3, 1.25])
+        self.assertTrue(valores[2:].isna().all())
+
+
+@override_settings(IPC_BUILD_EXPORT_ARTIFACTS=False)
+class LoaderTests(TestCase):
+    """
+    Carga de un Parquet temporal: conteos, estado de la base de datos y
+    carga incremental
+    """
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta = os.path.join(self.directorio.name, 'ipc_data.parquet')
+
+        ajustes = override_settings(PARQUET_FILES={'chile': {'ipc': self.ruta}})
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def write_parquet(self, mensual=None, filas=12):
+        # Columnas del Excel original, en float32
+        fechas = pd.date_range('2023-01-01', periods=filas, freq='MS')
+        pd.DataFrame({
+            'Periodo': fechas.strftime('%Y-%m-%d'),
+            '1. Variación Mensual': mensual or [0.3 + i / 10 for i in range(filas)],
+            '2. Variación Anual': [4.0 + i / 10 for i in range(filas)],
+        }).astype({'1. Variación Mensual': 'float32', '2. Variación Anual': 'float32'}).to_parquet(self.ruta)
+
+    def load(self, **kwargs):
+        return IPCDataLoader().load_data(**kwargs)
+
+    def test_first_load_and_reload(self):
+        self.write_parquet()
+
+        resultado = self.load()
+        self.assertEqual(
+            resultado,
+            {'created': 12, 'updated': 0, 'unchanged': 0, 'errors': 0, 'skipped': False}
+        )
+        self.assertEqual(IPCData.objects.count(), 12)
+        primero = IPCData.objects.get(periodo='ene.2023')
+        self.assertEqual(primero.fecha, date(2023, 1, 1))
+        self.assertEqual(primero.variacion_mensual, Decimal('0.30'))
+
+        # Misma fuente: nada cambia y updated_at se conserva
+        actualizados = dict(IPCData.objects.values_list('periodo', 'updated_at'))
+        resultado = self.load()
+        self.assertEqual(
+            resultado,
+            {'created': 0, 'updated': 0, 'unchanged': 12, 'errors': 0, 'skipped': False}
+        )
+        self.assertEqual(dict(IPCData.objects.values_list('periodo', 'updated_at')), actualizados)
+
+    def test_series_api_reads_observaciones(self):
+        self.write_parquet()
+        self.load()
+
+        url = reverse('ipc:api_series', args=['chile.ipc.variacion_mensual'])
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'limit': 3})
+        self.assertEqual(response.json()['fechas'], ['2023-10-01', '2023-11-01', '2023-12-01'])
+        self.assertEqual(response.json()['valores'], [1.2, 1.3, 1.4])
+
+        rango = self.client.get(url, {'from': '2023-02-01', 'to': '2023-03-01'}).json()
+        self.assertEqual(rango['valores'], [0.4, 0.5])
+
+        self.assertEqual(self.client.get(reverse('ipc:api_series', args=['chile.otra'])).status_code, 404)
+
+    def test_changed_rows_are_updated(self):
+        self.write_parquet()
+        self.load()
+
+        # dic.2023 cambia y se agrega ene.2024
+        mensual = [0.3 + i / 10 for i in range(13)]
+        mensual[11] = 9.5
+        self.write_parquet(mensual=mensual, filas=13)
+
+        resultado = self.load()
+        self.assertEqual(resultado['created'], 1)
+        self.assertEqual(resultado['updated'], 1)
+        self.assertEqual(resultado['unchanged'], 11)
+        self.assertEqual(IPCData.objects.get(periodo='dic.2023').variacion_mensual, Decimal('9.50'))
+
+    def test_series_are_synced(self):
+        self.write_parquet()
+        self.load()
+
+        serie = Serie.objects.get(codigo='chile.ipc.variacion_anual')
+        self.assertEqual(serie.observaciones.count(), 12)
+        self.assertEqual(serie.observaciones.get(fecha=date(2023, 12, 1)).valor, Decimal('5.1'))
+
+        # Solo las filas nuevas o modificadas se vuelven a escribir
+        self.write_parquet(filas=13)
+        self.load()
+        self.assertEqual(serie.observaciones.count(), 13)
+
+    def test_edits_outside_loader_are_mirrored(self):
+        self.write_parquet()
+        self.load()
+        anual = Serie.objects.get(codigo='chile.ipc.variacion_anual').observaciones
+
+        # Edición como la del admin
+        registro = IPCData.objects.get(periodo='dic.2023')
+        registro.variacion_anual = Decimal('9.99')
+        registro.save()
+        self.assertEqual(anual.get(fecha=date(2023, 12, 1)).valor, Decimal('9.99'))
+
+        registro.fecha = date(2023, 12, 15)
+        registro.save()
+        self.assertFalse(anual.filter(fecha=date(2023, 12, 1)).exists())
+        self.assertEqual(anual.get(fecha=date(2023, 12, 15)).valor, Decimal('9.99'))
+
+        registro.delete()
+        self.assertEqual(anual.count(), 11)
+        self.assertFalse(anual.filter(fecha=date(2023, 12, 15)).exists())
+
+    def test_invalid_rows_are_counted(self):
+        pd.DataFrame({
+            'Periodo': ['ene.2023', 'xyz', '2023-03-01'],
+            '1. Variación Mensual': ['0,4', '0,1', 'n/d'],
+            '2. Variación Anual': ['4,0', '4,1', '4,2'],
+        }).to_parquet(self.ruta)
+
+        resultado = self.load()
+        self.assertEqual(resultado['created'], 1)
+        self.assertEqual(resultado['errors'], 2)
+        self.assertEqual(IPCData.objects.get().variacion_mensual, Decimal('0.40'))
+
+    def test_parsed_source_round_trips_through_temp_file(self):
+        pd.DataFrame({
+            'Periodo': ['ene.2023', 'xyz', '2023-03-01', 'abr.2023'],
+            '1. Variación Mensual': ['0,4', '0,1', 'n/d', '0,5'],
+            '2. Variación Anual': ['4,0', '4,1', '4,2', '4,3'],
+        }).to_parquet(self.ruta)
+
+        ruta, descartadas, _ = parse_source('chile', 'ipc', 1)
+        self.addCleanup(os.remove, ruta)
+        # Un row group por lote con filas válidas
+        self.assertEqual(pq.ParquetFile(ruta).num_row_groups, 2)
+        self.assertEqual(descartadas, 2)
+
+        resultado = IPCDataLoader().write_frames(read_parsed(ruta, descartadas))
+        self.assertEqual((resultado['created'], resultado['errors']), (2, 2))
+        self.assertEqual(
+            list(IPCData.objects.order_by('fecha').values_list('periodo', 'variacion_mensual')),
+            [('ene.2023', Decimal('0.40')), ('abr.2023', Decimal('0.50'))],
+        )
+
+        # Sin filas válidas: igual se informan las descartadas
+        pd.DataFrame({
+            'Periodo': ['xyz'], '1. Variación Mensual': ['0,1'], '2. Variación Anual': ['4,1'],
+        }).to_parquet(self.ruta)
+        ruta, descartadas, _ = parse_source('chile', 'ipc', None)
+        self.addCleanup(os.remove, ruta)
+        resultado = IPCDataLoader().write_frames(read_parsed(ruta, descartadas))
+        self.assertEqual((resultado['created'], resultado['errors']), (0, 1))
+
+    def test_bulk_matches_per_row(self):
+        self.write_parquet()
+
+        self.assertEqual(self.load(bulk=False)['created'], 12)
+        por_fila = list(IPCData.objects.order_by('fecha').values_list('periodo', 'fecha', 'variacion_mensual', 'variacion_anual'))
+
+        IPCData.objects.all().delete()
+        self.load(batch_size=5)
+        en_bloque = list(IPCData.objects.order_by('fecha').values_list('periodo', 'fecha', 'variacion_mensual', 'variacion_anual'))
+
+        self.assertEqual(en_bloque, por_fila)
+
+    def test_chunked_read(self):
+        # Columnas extra en el archivo: se leen solo las esperadas
+        fechas = pd.date_range('2023-01-01', periods=12, freq='MS')
+        pd.DataFrame({
+            ' Periodo ': fechas.strftime('%Y-%m-%d'),
+            '1. Variación Mensual': [0.3 + i / 10 for i in range(12)],
+            '2. Variación Anual': [4.0 + i / 10 for i in range(12)],
+            'Notas': ['x'] * 12,
+        }).to_parquet(self.ruta, row_group_size=4)
+
+        resultado = self.load(chunk_size=5)
+        self.assertEqual((resultado['created'], resultado['errors']), (12, 0))
+        self.assertEqual(IPCData.objects.order_by('fecha').last().periodo, 'dic.2023')
+
+        # Lotes de otro tamaño: mismas filas, nada cambia
+        self.assertEqual(self.load(chunk_size=7)['unchanged'], 12)
+
+    def test_incremental_skip_and_hash_fallback(self):
+        self.write_parquet()
+        self.load(incremental=True)
+
+        with self.assertNumQueries(1):
+            resultado = IPCDataLoader().load_data(incremental=True)
+        self.assertTrue(resultado['skipped'])
+        self.assertEqual(resultado['unchanged'], 12)
+
+        # Otra fecha de modificación con el mismo contenido: se omite por hash
+        stat = os.stat(self.ruta)
+        os.utime(self.ruta, (stat.st_atime, stat.st_mtime + 60))
+        self.assertTrue(IPCDataLoader().load_data(incremental=True)['skipped'])
+        self.assertEqual(FuenteDatos.objects.get().mtime, stat.st_mtime + 60)
+
+        # Contenido distinto: se carga
+        self.write_parquet(filas=13)
+        resultado = self.load(incremental=True)
+        self.assertFalse(resultado['skipped'])
+        self.assertEqual(resultado['created'], 1)
+
+    def test_other_source_skips_ipcdata(self):
+        self.write_parquet()
+        with override_settings(PARQUET_FILES={'chile': {'ipc': self.ruta}, 'peru': {'ipc': self.ruta}}):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                resultado = IPCDataLoader('peru', 'ipc').load_data()
+            self.assertEqual(resultado['created'], 12)
+            self.assertFalse(IPCData.objects.exists())
+            self.assertFalse(EstadisticasSerie.objects.exists())
+            self.assertEqual(callbacks, [])
+            serie = Serie.objects.get(codigo='peru.ipc.variacion_anual')
+            self.assertEqual(serie.observaciones.count(), 12)
+
+            resultado = IPCDataLoader('peru', 'ipc').load_data()
+            self.assertEqual((resultado['created'], resultado['unchanged']), (0, 12))
+
+    def test_dataset_reads_only_its_partition(self):
+        fuentes = []
+        for pais, filas in [('chile', 14), ('peru', 5)]:
+            fechas = pd.date_range('2023-01-01', periods=filas, freq='MS')
+            pd.DataFrame({
+                'Periodo': fechas.strftime('%Y-%m-%d'),
+                'Mensual': [0.3] * filas,
+                'Anual': [4.0] * filas,
+            }).to_csv(os.path.join(self.directorio.name, f'{pais}.csv'), index=False)
+            fuentes.append({
+                'pais': pais, 'indicador': 'ipc', 'archivo': f'{pais}.csv',
+                'columnas': {'Periodo': 'periodo', 'Mensual': 'variacion_mensual', 'Anual': 'variacion_anual'},
+            })
+
+        manifiesto = os.path.join(self.directorio.name, 'sources.json')
+        with open(manifiesto, 'w', encoding='utf-8') as f:
+            json.dump({'sources': fuentes}, f)
+        raiz = os.path.join(self.directorio.name, 'dataset')
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_dataset(manifiesto, raiz, workers=1, base_dir=self.directorio.name)
+
+        with override_settings(PARQUET_FILES={'chile': {'ipc': raiz}}):
+            resultado = self.load(incremental=True)
+            self.assertEqual((resultado['created'], resultado['errors']), (14, 0))
+            self.assertEqual(IPCData.objects.order_by('fecha').last().periodo, 'feb.2024')
+            self.assertTrue(self.load(incremental=True)['skipped'])
+
+    def test_configured_dataset_is_built(self):
+        # PARQUET_FILES apunta al dataset del repositorio, que debe estar
+        # construido desde el manifiesto
+        with open(os.path.join(settings.PARQUET_DATASET_DIR, STATE_FILE), encoding='utf-8') as f:
+            filas = json.load(f)['chile/ipc']['filas']
+
+        with override_settings(PARQUET_FILES={'chile': {'ipc': settings.PARQUET_DATASET_DIR}}):
+            frames = list(IPCDataLoader().read_frames())
+        self.assertEqual(sum(len(registros) for registros, _ in frames), filas)
+        self.assertEqual(sum(errores for _, errores in frames), 0)
+
+
+class DashboardQueriesTests(TestCase):
+    """
+    Las páginas se arman desde la copia en memoria: una vez cargada no
+    consultan la base de datos mientras la versión de los datos no cambie
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        meses = ['ene', 'feb', 'mar', 'abr', 'may', 'jun', 'jul', 'ago', 'sep', 'oct', 'nov', 'dic']
+        IPCData.objects.bulk_create([
+            IPCData(
+                periodo=f"{meses[mes - 1]}.{anio}",
+                fecha=date(anio, mes, 1),
+                variacion_mensual=Decimal('0.30') + Decimal(mes) / 100,
+                variacion_anual=Decimal('4.00') + Decimal(mes) / 10,
+            )
+            for anio in (2023, 2024)
+            for mes in range(1, 13)
+        ])
+        bump_ipc_version()
+
+    def setUp(self):
+        cache.clear()
+        _snapshots.clear()
+
+    def test_dashboard_queries(self):
+        # Versión de los datos + carga de la copia en memoria
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('ipc:dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_records'], 24)
+        self.assertEqual(response.context['latest_record']['periodo'], 'dic.2024')
+        self.assertEqual(response.context['oldest_record']['periodo'], 'ene.2023')
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('ipc:dashboard'))
+
+    def test_ipc_detail_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('ipc:ipc_detail'))
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('ipc:ipc_detail'))
+
+    def test_ipc_detail_embeds_initial_data(self):
+        response = self.client.get(reverse('ipc:ipc_detail'))
+
+        self.assertContains(response, 'id="initial-chart"')
+        self.assertContains(response, 'id="initial-summary"')
+        self.assertContains(response, 'id="initial-table"')
+
+        # Mismos datos que devolverían las APIs al cargar la página
+        chart = self.client.get(reverse('ipc:api_ipc_chart'), {'limit': 24}).json()
+        summary = self.client.get(reverse('ipc:api_ipc_summary')).json()
+        table = self.client.get(reverse('ipc:api_ipc_query'), {'order': 'desc', 'limit': 12}).json()
+
+        self.assertEqual(response.context['initial_chart'], chart)
+        self.assertEqual(response.context['initial_summary'], summary)
+        self.assertEqual(json.loads(json.dumps(response.context['initial_table'], default=str)), table)
+
+    def test_new_load_refreshes_pages(self):
+        self.client.get(reverse('ipc:dashboard'))
+
+        # La nueva versión se publica en la caché al hacer commit
+        with self.captureOnCommitCallbacks(execute=True):
+            IPCData.objects.create(
+                periodo='ene.2025',
+                fecha=date(2025, 1, 1),
+                variacion_mensual=Decimal('1.10'),
+                variacion_anual=Decimal('4.90'),
+            )
+
+        response = self.client.get(reverse('ipc:dashboard'))
+        self.assertEqual(response.context['total_records'], 25)
+        self.assertEqual(response.context['latest_record']['periodo'], 'ene.2025')
+
+    def test_indicators_window_is_bounded(self):
+        url = reverse('ipc:api_ipc_indicators')
+        self.assertEqual(self.client.get(url, {'window': 120}).status_code, 200)
+        self.assertEqual(self.client.get(url, {'window': 121}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'window': 0}).status_code, 400)
+
+    def test_indicators_api(self):
+        response = self.client.get(reverse('ipc:api_ipc_indicators'), {
+            'indicators': 'rolling_mean,index', 'window': 3, 'from': '2024-01-01',
+        })
+        datos = response.json()
+
+        self.assertEqual(datos['labels'][0], 'ene.2024')
+        self.assertEqual(len(datos['labels']), 12)
+        # La media de ene.2024 usa nov y dic de 2023
+        self.assertAlmostEqual(datos['indicators']['rolling_mean'][0], (0.41 + 0.42 + 0.31) / 3, places=4)
+        self.assertEqual(len(datos['indicators']['index']), 12)
+
+        mensual_2024 = [0.30 + mes / 100 for mes in range(1, 13)]
+        self.assertEqual(datos['cumulative']['from'], 'ene.2024')
+        self.assertEqual(datos['cumulative']['to'], 'dic.2024')
+        self.assertAlmostEqual(datos['cumulative']['inflation'], (np.prod([1 + m / 100 for m in mensual_2024]) - 1) * 100, places=4)
+
+        invalido = self.client.get(reverse('ipc:api_ipc_indicators'), {'indicators': 'xyz'})
+        self.assertEqual(invalido.status_code, 400)
+
+    def test_chart_resampled(self):
+        url = reverse('ipc:api_ipc_chart')
+        datos = self.client.get(url, {'freq': 'Q', 'limit': 'all', 'compact': 1}).json()
+
+        self.assertEqual(datos['labels'], [f'T{t}.{anio}' for anio in (2023, 2024) for t in range(1, 5)])
+        self.assertAlmostEqual(datos['mensual'][0], (1.0031 * 1.0032 * 1.0033 - 1) * 100, places=4)
+        # Variación anual del último mes del trimestre (mar)
+        self.assertEqual(datos['anual'][0], 4.3)
+
+        anual = self.client.get(url, {'freq': 'Y', 'limit': 'all', 'compact': 1}).json()
+        self.assertEqual(anual['labels'], ['2023', '2024'])
+        self.assertEqual(self.client.get(url, {'freq': 'W'}).status_code, 400)
+
+    def test_chart_max_points(self):
+        url = reverse('ipc:api_ipc_chart')
+        completo = self.client.get(url, {'limit': 'all', 'compact': 1}).json()
+
+        for metodo in ['lttb', 'minmax']:
+            datos = self.client.get(url, {'limit': 'all', 'compact': 1, 'max_points': 8, 'downsample': metodo}).json()
+            self.assertLessEqual(len(datos['labels']), 8)
+            self.assertEqual(len(datos['mensual']), len(datos['labels']))
+            self.assertEqual(datos['labels'][0], completo['labels'][0])
+            self.assertEqual(datos['labels'][-1], completo['labels'][-1])
+
+        # Menos puntos que la ventana pedida: sin cambios
+        self.assertEqual(self.client.get(url, {'limit': 'all', 'compact': 1, 'max_points': 100}).json(), completo)
+
+        self.assertEqual(self.client.get(url, {'max_points': MIN_POINTS - 1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'max_points': 10, 'downsample': 'xyz'}).status_code, 400)
+
+    def test_filtered_export_streams(self):
+        url = reverse('ipc:api_ipc_export')
+        response = self.client.get(url, {'format': 'csv', 'from': '2024-01-01'})
+        self.assertTrue(response.streaming)
+        filas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(filas), 13)
+
+        response = self.client.get(url, {'format': 'parquet', 'from': '2024-01-01'})
+        self.assertTrue(response.streaming)
+
+    def test_excel_export_parses(self):
+        response = self.client.get(reverse('ipc:api_ipc_export_excel'))
+        self.assertEqual(response.status_code, 200)
+        libro = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        response.close()
+
+        self.assertEqual(libro.sheetnames, ['Página 1', 'Página 2', 'Resumen'])
+        filas = list(libro['Página 1'].values)
+        self.assertEqual(filas[0][:4], ('Período', 'Fecha', 'Variación Mensual (%)', 'Variación Anual (%)'))
+        self.assertEqual(len(filas), 13)
+        # Más reciente primero
+        self.assertEqual(filas[1][:4], ('dic.2024', '01/12/2024', 0.42, 5.2))
+        self.assertEqual(list(libro['Página 2'].values)[-1][0], 'ene.2023')
+
+        resumen = dict(list(libro['Resumen'].values)[1:])
+        self.assertEqual(resumen['Total de Registros'], 24)
+        self.assertEqual(resumen['Período Más Antiguo'], 'ene.2023')
+        self.assertEqual(resumen['Período Más Reciente'], 'dic.2024')
+
+    def test_arrow_export_parses(self):
+        response = self.client.get(reverse('ipc:api_ipc_export'), {'format': 'arrow', 'from': '2024-01-01'})
+        self.assertEqual(response.status_code, 200)
+        tabla = pa.ipc.open_stream(b''.join(response.streaming_content)).read_all()
+        response.close()
+
+        self.assertEqual(tabla.column_names, ['periodo', 'fecha', 'variacion_mensual', 'variacion_anual'])
+        self.assertEqual(tabla.schema.field('fecha').type, pa.date32())
+        self.assertEqual(tabla.num_rows, 12)
+        self.assertEqual(tabla.column('periodo').to_pylist()[0], 'ene.2024')
+        self.assertEqual(tabla.column('fecha').to_pylist()[-1], date(2024, 12, 1))
+        self.assertEqual(tabla.column('variacion_mensual').to_pylist()[0], 0.31)
+        self.assertEqual(tabla.column('variacion_anual').to_pylist()[-1], 5.2)
+
+
+class IndicatorTests(SimpleTestCase):
+    """
+    Cálculos de ipc/indicators.py sobre series conocidas
+    """
+
+    def test_rolling_mean(self):
+        resultado = rolling_mean(np.array([1.0, 2.0, 3.0, 4.0]), 2)
+        self.assertTrue(np.isnan(resultado[0]))
+        np.testing.assert_allclose(resultado[1:], [1.5, 2.5, 3.5])
+
+        # Ventana más larga que la serie: todo NaN
+        self.assertTrue(np.isnan(rolling_mean(np.array([1.0, 2.0]), 3)).all())
+
+    def test_annualized_rate(self):
+        # 1% mensual constante: 12.68% anualizado con cualquier ventana
+        resultado = annualized_rate(np.full(8, 1.0), 3)
+        self.assertTrue(np.isnan(resultado[:2]).all())
+        np.testing.assert_allclose(resultado[2:], (1.01 ** 12 - 1) * 100)
+
+        # 2% y luego 0%: la ventana de 2 meses compone ambos
+        resultado = annualized_rate(np.array([2.0, 0.0]), 2)
+        self.assertAlmostEqual(resultado[1], (1.02 ** 6 - 1) * 100)
+
+    def test_price_index_and_cumulative_inflation(self):
+        np.testing.assert_allclose(price_index(np.array([1.0, -1.0])), [101.0, 99.99])
+        self.assertAlmostEqual(cumulative_inflation(np.array([10.0, 10.0])), 21.0)
+        self.assertIsNone(cumulative_inflation(np.array([])))
+
+
+class DownsamplingTests(SimpleTestCase):
+    """
+    LTTB y min-max sobre una serie conocida
+    """
+
+    def setUp(self):
+        # Onda con un pico y un valle aislados
+        self.valores = np.sin(np.linspace(0, 6 * np.pi, 500))
+        self.valores[137] = 5.0
+        self.valores[402] = -5.0
+
+    def assert_valid(self, indices, n):
+        self.assertLessEqual(len(indices), n)
+        self.assertTrue((np.diff(indices) > 0).all())
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(self.valores) - 1)
+
+    def test_lttb(self):
+        for n in [MIN_POINTS, 10, 50]:
+            indices = lttb_indices(self.valores, n)
+            self.assertEqual(len(indices), n)
+            self.assert_valid(indices, n)
+
+        # El pico y el valle forman los triángulos más grandes de su tramo
+        indices = lttb_indices(self.valores, 20)
+        self.assertIn(137, indices)
+        self.assertIn(402, indices)
+
+    def test_minmax_keeps_bucket_extremes(self):
+        for n in [MIN_POINTS, 10, 51]:
+            indices = minmax_indices(self.valores, n)
+            self.assert_valid(indices, n)
+
+            tramos = (n - 2) // 2
+            if not tramos:
+                continue
+            tramo = np.arange(len(self.valores)) * tramos // len(self.valores)
+            elegidos = set(indices.tolist())
+            for numero in range(tramos):
+                miembros = np.flatnonzero(tramo == numero)
+                valores = self.valores[miembros]
+                self.assertIn(miembros[np.argmin(valores)], elegidos)
+                self.assertIn(miembros[np.argmax(valores)], elegidos)
+
+    def test_short_series_is_kept(self):
+        np.testing.assert_array_equal(lttb_indices(self.valores[:5], 10), np.arange(5))
+        np.testing.assert_array_equal(minmax_indices(self.valores[:5], 10), np.arange(5))
+
+    def test_downsample_indices_shared(self):
+        otra = np.cos(np.linspace(0, 6 * np.pi, 500))
+        for metodo in ['lttb', 'minmax']:
+            indices = downsample_indices([self.valores, otra], 40, metodo)
+            self.assert_valid(indices, 40)
+
+
+class ResampleTests(SimpleTestCase):
+    """
+    Agregación trimestral y anual con períodos incompletos en los extremos
+    """
+
+    def setUp(self):
+        # nov.2023 a feb.2025: 1% mensual, variación anual = número de mes
+        fechas = pd.date_range('2023-11-01', '2025-02-01', freq='MS')
+        self.snapshot = IPCSnapshot.from_rows(1, [
+            (f'm{numero}', fecha.date(), 1.0, float(fecha.month), numero)
+            for numero, fecha in enumerate(fechas)
+        ])
+
+    def test_quarterly(self):
+        trimestral = resample(self.snapshot, 'Q', clave='tests.resample')
+
+        self.assertEqual(trimestral.periodos.tolist(), ['T4.2023', 'T1.2024', 'T2.2024', 'T3.2024', 'T4.2024', 'T1.2025'])
+        # Cada período empieza en su primer mes con datos
+        self.assertEqual(trimestral.fechas[0], np.datetime64('2023-11-01'))
+        self.assertEqual(trimestral.fechas[1], np.datetime64('2024-01-01'))
+        # Trimestres incompletos componen solo sus meses
+        np.testing.assert_allclose(trimestral.mensual, np.round([2.01, 3.0301, 3.0301, 3.0301, 3.0301, 2.01], 4))
+        self.assertEqual(trimestral.anual.tolist(), [12.0, 3.0, 6.0, 9.0, 12.0, 2.0])
+
+    def test_yearly(self):
+        anual = resample(self.snapshot, 'Y', clave='tests.resample')
+
+        self.assertEqual(anual.periodos.tolist(), ['2023', '2024', '2025'])
+        np.testing.assert_allclose(anual.mensual, np.round([2.01, (1.01 ** 12 - 1) * 100, 2.01], 4))
+        self.assertEqual(anual.anual.tolist(), [12.0, 12.0, 2.0])
+
+    def test_monthly_is_the_snapshot(self):
+        self.assertIs(resample(self.snapshot, 'M', clave='tests.resample'), self.snapshot)
+
+
+class ArtifactTests(TestCase):
+    """
+    Exports completos pre-generados por versión: generación, envío,
+    limpieza de versiones anteriores y respuesta directa si falta el archivo
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        IPCData.objects.bulk_create([
+            IPCData(periodo=f'{mes}.2024', fecha=date(2024, numero, 1),
+                    variacion_mensual=Decimal('0.30'), variacion_anual=Decimal('4.00'))
+            for numero, mes in enumerate(['ene', 'feb', 'mar'], start=1)
+        ])
+        bump_ipc_version()
+
+    def setUp(self):
+        cache.clear()
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.base = os.path.join(directorio.name, IPC_KEY)
+
+        ajustes = override_settings(EXPORT_ARTIFACTS_DIR=directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+    def version(self):
+        return EstadisticasSerie.objects.get(pk=IPC_KEY).version
+
+    def test_build_and_serve(self):
+        build_artifacts()
+        self.assertEqual(os.listdir(self.base), [f'v{self.version()}'])
+
+        response = self.client.get(reverse('ipc:api_ipc_export'), {'format': 'csv'})
+        self.assertIsInstance(response, FileResponse)
+        with open(artifact_path('csv', self.version()), 'rb') as f:
+            self.assertEqual(b''.join(response.streaming_content), f.read())
+        response.close()
+
+        response = self.client.get(reverse('ipc:api_ipc_export_excel'))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    def test_old_versions_are_removed(self):
+        build_artifacts()
+        anterior = self.version()
+
+        bump_ipc_version()
+        cache.clear()
+        build_artifacts()
+
+        self.assertEqual(os.listdir(self.base), [f'v{self.version()}'])
+        self.assertNotEqual(self.version(), anterior)
+
+    def test_missing_artifact_is_not_built_by_requests(self):
+        build_artifacts()
+        # Versión borrada por otra carga mientras este proceso aún la cree actual
+        shutil.rmtree(os.path.join(self.base, f'v{self.version()}'))
+
+        for formato in ['csv', 'parquet', 'arrow']:
+            response = self.client.get(reverse('ipc:api_ipc_export'), {'format': formato})
+            self.assertEqual(response.status_code, 200)
+            if formato != 'parquet':
+                self.assertNotIsInstance(response, FileResponse)
+            self.assertTrue(b''.join(response.streaming_content))
+            response.close()
+        response = self.client.get(reverse('ipc:api_ipc_export_excel'))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+        self.assertEqual(os.listdir(self.base), [])
+
+
+class ParquetBackendTests(TestCase):
+    """
+    Con IPC_READ_BACKEND = 'parquet' las APIs responden desde el archivo
+    sin consultar la base de datos, con los mismos datos que el backend 'db'
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directorio = tempfile.TemporaryDirectory()
+        cls.ruta = os.path.join(cls.directorio.name, 'ipc_data.parquet')
+
+        # Mismo formato que data/parquet/chile/ipc_data.parquet
+        fechas = pd.date_range('2023-01-01', periods=24, freq='MS')
+        pd.DataFrame({
+            'Periodo': fechas.strftime('%Y-%m-%d'),
+            '1. Variación Mensual': [0.30 + fecha.month / 100 for fecha in fechas],
+            '2. Variación Anual': [4.00 + fecha.month / 10 for fecha in fechas],
+        }).astype({'1. Variación Mensual': 'float32', '2. Variación Anual': 'float32'}).to_parquet(cls.ruta)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directorio.cleanup()
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        DashboardQueriesTests.setUpTestData()
+
+    def setUp(self):
+        cache.clear()
+        _snapshots.clear()
+
+    def _get_all(self):
+        return [
+            self.client.get(reverse('ipc:api_ipc_chart'), {'limit': 24}).json(),
+            self.client.get(reverse('ipc:api_ipc_summary')).json(),
+            self.client.get(reverse('ipc:api_ipc_query'), {'from': '2023-06-01', 'to': '2024-03-01'}).json(),
+        ]
+
+    def test_same_responses_without_queries(self):
+        esperado = self._get_all()
+        cache.clear()
+        _snapshots.clear()
+
+        with override_settings(IPC_READ_BACKEND='parquet', PARQUET_FILES={'chile': {'ipc': self.ruta}}):
+            with self.assertNumQueries(0):
+                self.assertEqual(self._get_all(), esperado)
+
+    def test_query_pagination(self):
+        with override_settings(IPC_READ_BACKEND='parquet', PARQUET_FILES={'chile': {'ipc': self.ruta}}):
+            for order in ('asc', 'desc'):
+                periodos = []
+                params = {'order': order, 'limit': 5, 'fields': 'periodo', 'from': '2023-03-01'}
+                while True:
+                    pagina = self.client.get(reverse('ipc:api_ipc_query'), params).json()
+                    periodos += pagina['data']['periodo']
+                    if not pagina['next']:
+                        break
+                    params['cursor'] = pagina['next']
+
+                self.assertEqual(len(periodos), 22)
+                self.assertEqual(periodos[0 if order == 'asc' else -1], 'mar.2023')
+                self.assertEqual(len(set(periodos)), 22)
+
+
+class AsyncViewsTests(TestCase):
+    """
+    Las vistas async responden lo mismo que las síncronas
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        DashboardQueriesTests.setUpTestData()
+
+    def setUp(self):
+        cache.clear()
+        _snapshots.clear()
+
+    async def test_same_responses(self):
+        pares = [
+            ('ipc:api_ipc_chart', 'ipc:api_ipc_chart_async', {'limit': 'all', 'freq': 'Q'}),
+            ('ipc:api_ipc_summary', 'ipc:api_ipc_summary_async', {}),
+            ('ipc:api_ipc_query', 'ipc:api_ipc_query_async', {'order': 'desc', 'limit': 5, 'from': '2023-06-01'}),
+        ]
+        for sincrona, asincrona, params in pares:
+            esperado = await self.async_client.get(reverse(sincrona), params)
+            response = await self.async_client.get(reverse(asincrona), params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), esperado.json())
+            self.assertEqual(response['ETag'], esperado['ETag'])
+
+        # La página siguiente con el cursor de la vista async
+        siguiente = await self.async_client.get(
+            reverse('ipc:api_ipc_query_async'), {'order': 'desc', 'limit': 5, 'cursor': response.json()['next']}
+        )
+        self.assertEqual(siguiente.json()['data']['periodo'][0], 'jul.2024')
+
+    async def test_not_modified(self):
+        response = await self.async_client.get(reverse('ipc:api_ipc_summary_async'))
+        response = await self.async_client.get(
+            reverse('ipc:api_ipc_summary_async'), headers={'if-none-match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_coalesced_reads(self):
+        lecturas = []
+
+        async def leer():
+            lecturas.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+
+        resultados = await asyncio.gather(*(coalesced('clave', leer) for _ in range(50)))
+        self.assertEqual(resultados, [42] * 50)
+        self.assertEqual(len(lecturas), 1)
+
+
+class CachedTests(SimpleTestCase):
+    """
+    Un solo recálculo por clave, y los valores vencidos se sirven mientras
+    se recalculan
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.calculos = []
+
+    def compute(self, valor='nuevo'):
+        self.calculos.append(valor)
+        return valor
+
+    def test_miss_and_hit(self):
+        self.assertEqual(cached('k', self.compute), 'nuevo')
+        self.assertEqual(cached('k', self.compute), 'nuevo')
+        self.assertEqual(len(self.calculos), 1)
+        self.assertIsNone(cache.get('k:lock'))
+
+    def test_stale_value_refreshed_in_background(self):
+        refrescado = threading.Event()
+
+        def compute():
+            refrescado.set()
+            return self.compute()
+
+        cache.set('k', ('viejo', 0.01, time.time() - 1), 60)
+
+        # Se sirve el valor vencido; solo la primera lectura lanza el recálculo
+        self.assertEqual(cached('k', compute), 'viejo')
+        self.assertTrue(refrescado.wait(2))
+        for _ in range(100):
+            if cache.get('k')[0] == 'nuevo':
+                break
+            time.sleep(0.01)
+        self.assertEqual(cached('k', compute), 'nuevo')
+        self.assertEqual(self.calculos, ['nuevo'])
+
+    def test_waits_for_request_holding_lock(self):
+        cache.add('k:lock', 1, 10)
+        threading.Timer(0.1, lambda: cache.set('k', ('de otro', 0.01, time.time() + 60), 60)).start()
+
+        self.assertEqual(cached('k', self.compute), 'de otro')
+        self.assertEqual(self.calculos, [])
+
+    async def test_async_single_flight(self):
+        async def compute():
+            await asyncio.sleep(0.01)
+            return self.compute()
+
+        resultados = await asyncio.gather(*(acached('k', compute) for _ in range(20)))
+        self.assertEqual(resultados, ['nuevo'] * 20)
+        self.assertEqual(len(self.calculos), 1)
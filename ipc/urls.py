@@ -12,5 +12,16 @@ urlpatterns = [
     # APIs para gráficos
     path('api/ipc/chart/', views.api_ipc_chart_data, name='api_ipc_chart'),
     path('api/ipc/summary/', views.api_ipc_summary, name='api_ipc_summary'),
+    path('api/ipc/query/', views.api_ipc_query, name='api_ipc_query'),
+    path('api/ipc/indicators/', views.api_ipc_indicators, name='api_ipc_indicators'),
     path('api/ipc/export-excel/', views.api_ipc_export_excel, name='api_ipc_export_excel'),
+    path('api/ipc/export/', views.api_ipc_export, name='api_ipc_export'),
+
+    # Cualquier serie del catálogo (Serie + Observacion)
+    path('api/series/<str:codigo>/', views.api_series, name='api_series'),
+
+    # Versiones async de las APIs de sondeo (despliegue ASGI)
+    path('api/ipc/async/chart/', views.api_ipc_chart_data_async, name='api_ipc_chart_async'),
+    path('api/ipc/async/summary/', views.api_ipc_summary_async, name='api_ipc_summary_async'),
+    path('api/ipc/async/query/', views.api_ipc_query_async, name='api_ipc_query_async'),
 ]
@@ -1,14 +1,69 @@
 from django.shortcuts import render
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, FileResponse, StreamingHttpResponse
 from django.views.generic import TemplateView
-from django.core.cache import cache
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
-from .models import IPCData
+from django.db.models import Q
+from .models import IPCData, Serie
+from .series import ultimos_puntos, rango
+from .caching import versioned_key, aversioned_key, conditional_on_data, aconditional_on_data, reads_from_parquet
+from .artifacts import open_artifact
+from .snapshot import get_snapshot, aget_snapshot
+from .cached import cached, acached
+from .coalescing import coalesced
+from .downsampling import DOWNSAMPLERS, MIN_POINTS, downsample_indices
+from .serialization import DatasetTemplate, dumps, encode_array, encode_object, json_bytes_response
+from .indicators import (
+    INDICATORS, DEFAULT_WINDOW, MAX_WINDOW, DERIVED_DIGITS, FREQUENCIES,
+    cumulative_inflation, derived_series, resample,
+)
+from .exports import (
+    write_ipc_workbook, write_parquet, stream_csv, stream_arrow,
+    EXCEL_CONTENT_TYPE, EXPORT_CONTENT_TYPES, EXPORT_EXTENSIONS,
+)
+import base64
 import json
-import pandas as pd
-import io
-from datetime import datetime
+import tempfile
+from datetime import date, datetime
+
+# Parámetros de la API de consulta por rango
+QUERY_FIELDS = ['periodo', 'fecha', 'variacion_mensual', 'variacion_anual']
+QUERY_DEFAULT_LIMIT = 100
+QUERY_MAX_LIMIT = 1000
+
+# Filas de la primera página de la tabla en ipc_detail.html (rowsPerPage)
+TABLE_PAGE_SIZE = 12
+
+# Estilos de los datasets de Chart.js
+CHART_MENSUAL_STYLE = {
+    'label': 'Variación Mensual (%)',
+    'type': 'bar',
+    'backgroundColor': 'rgba(75, 192, 192, 0.7)',
+    'borderColor': 'rgb(75, 192, 192)',
+    'borderWidth': 1,
+    'yAxisID': 'y1'  # Eje derecho
+}
+CHART_ANUAL_STYLE = {
+    'label': 'Variación Anual (%)',
+    'type': 'line',
+    'borderColor': 'rgb(255, 99, 132)',
+    'backgroundColor': 'rgba(255, 99, 132, 0.1)',
+    'tension': 0.4,
+    'fill': False,
+    'borderWidth': 3,
+    'yAxisID': 'y'  # Eje izquierdo
+}
+
+# Datasets por frecuencia, codificados una sola vez
+CHART_DATASETS = {
+    'M': (DatasetTemplate(CHART_MENSUAL_STYLE), DatasetTemplate(CHART_ANUAL_STYLE)),
+    'Q': (
+        DatasetTemplate({**CHART_MENSUAL_STYLE, 'label': 'Variación Trimestral (%)'}),
+        DatasetTemplate({**CHART_ANUAL_STYLE, 'label': 'Variación Anual al cierre (%)'}),
+    ),
+    'Y': (
+        DatasetTemplate({**CHART_MENSUAL_STYLE, 'label': 'Variación del Año (%)'}),
+        DatasetTemplate({**CHART_ANUAL_STYLE, 'label': 'Variación Anual al cierre (%)'}),
+    ),
+}
 
 class DashboardView(TemplateView):
     """
@@ -19,16 +74,15 @@ class DashboardView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Obtener estadísticas básicas
-        total_records = IPCData.objects.count()
-        latest_record = IPCData.objects.first() if total_records > 0 else None
-        oldest_record = IPCData.objects.last() if total_records > 0 else None
+        # Estadísticas básicas desde la copia en memoria (sin consultas
+        # mientras la versión de los datos no cambie)
+        snapshot = get_snapshot()
         
         context.update({
             'page_title': 'Analytics Platform Chile',
-            'total_records': total_records,
-            'latest_record': latest_record,
-            'oldest_record': oldest_record,
+            'total_records': len(snapshot),
+            'latest_record': snapshot.latest_record,
+            'oldest_record': snapshot.oldest_record,
         })
         
         return context
@@ -36,256 +90,581 @@ class DashboardView(TemplateView):
 class IPCDetailView(TemplateView):
     """
     Vista específica para datos IPC
+
+    La página incluye los datos iniciales del gráfico, el resumen y la
+    primera página de la tabla (json_script), así que al cargarla no se
+    llama a las APIs.
     """
     template_name = 'dashboard/ipc_detail.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Obtener datos IPC
-        ipc_data = IPCData.objects.all().order_by('fecha')
-        
-        # Estadísticas
-        total_records = ipc_data.count()
-        latest = ipc_data.last() if total_records > 0 else None
-        
-        # Datos para mostrar en tabla (últimos 24 meses)
-        recent_data_queryset = IPCData.objects.all().order_by('-fecha')[:24]
-        # Convertir a lista y luego invertir
-        recent_data_list = list(recent_data_queryset)
-        recent_data_list.reverse()
+        snapshot = get_snapshot()
         
         context.update({
             'page_title': 'IPC - Índice de Precios al Consumidor',
-            'total_records': total_records,
-            'latest_record': latest,
-            'recent_data': recent_data_list,
+            'total_records': len(snapshot),
+            'latest_record': snapshot.latest_record,
+            'initial_chart': json.loads(chart_payload()),
+            'initial_summary': summary_payload(),
+            'initial_table': _first_table_page(snapshot),
         })
         
         return context
 
-@cache_page(300)  # Cache por 5 minutos
-def api_ipc_chart_data(request):
+
+def _first_table_page(snapshot, limit=TABLE_PAGE_SIZE):
     """
-    API para datos del gráfico IPC
+    Primera página de la tabla (más recientes primero) con el mismo
+    formato que api_ipc_query?order=desc
     """
-    # Obtener parámetros
-    limit = request.GET.get('limit', '24')
+    pagina = snapshot.tail(limit)
+    filas = pagina.records()[::-1]
 
-    # Crear clave de caché única
-    cache_key = f'ipc_chart_data_{limit}'
+    next_cursor = None
+    if len(snapshot) > limit:
+        ultima = filas[-1]
+        next_cursor = _encode_cursor(ultima['fecha'], int(pagina.ids[0]))
 
-    # Intentar obtener datos del caché
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return JsonResponse(cached_data)
-    
+    return {
+        'fields': QUERY_FIELDS,
+        'count': len(filas),
+        'data': {field: [fila[field] for fila in filas] for field in QUERY_FIELDS},
+        'next': next_cursor,
+    }
+
+def _chart_key_parts(limit, freq, max_points, metodo, compact):
+    # Clave única por parámetros (la versión de los datos la agrega versioned_key)
+    return ('chart', freq, limit, max_points, metodo if max_points else '', 'compact' if compact else 'full')
+
+def _build_chart_body(snapshot, limit, freq, max_points, metodo, compact):
+    """
+    JSON (bytes) del gráfico a partir de la copia en memoria
+    """
     if limit == 'all':
-        queryset = IPCData.objects.all().order_by('fecha')
+        limit_num = None
     else:
         try:
             limit_num = int(limit)
-            queryset = IPCData.objects.all().order_by('-fecha')[:limit_num]
-            # Convertir a lista y ordenar por fecha ascendente
-            queryset = sorted(list(queryset), key=lambda x: x.fecha)
         except ValueError:
             limit_num = 24
-            queryset = IPCData.objects.all().order_by('-fecha')[:limit_num]
-            queryset = sorted(list(queryset), key=lambda x: x.fecha)
-    
-    # Formatear para Chart.js
-    labels = []
-    mensual_data = []
-    anual_data = []
-    
-    for item in queryset:
-        labels.append(item.periodo)
-        mensual_data.append(float(item.variacion_mensual))
-        anual_data.append(float(item.variacion_anual))
+
+    # Corte de la copia en memoria (agregada si se pidió), ya en orden cronológico
+    serie = resample(snapshot, freq).tail(limit_num)
+
+    periodos, mensual, anual = serie.periodos, serie.mensual, serie.anual
+    if max_points is not None and len(serie) > max_points:
+        indices = downsample_indices([mensual, anual], max_points, metodo)
+        periodos, mensual, anual = periodos[indices], mensual[indices], anual[indices]
+
+    # Arreglos codificados de una vez
+    labels = encode_array(periodos)
+    mensual_data = encode_array(mensual)
+    anual_data = encode_array(anual)
     
-    chart_data = {
-        'labels': labels,
-        'datasets': [
-            {
-                'label': 'Variación Mensual (%)',
-                'type': 'bar',
-                'data': mensual_data,
-                'backgroundColor': 'rgba(75, 192, 192, 0.7)',
-                'borderColor': 'rgb(75, 192, 192)',
-                'borderWidth': 1,
-                'yAxisID': 'y1'  # Eje derecho
-            },
-            {
-                'label': 'Variación Anual (%)',
-                'type': 'line',
-                'data': anual_data,
-                'borderColor': 'rgb(255, 99, 132)',
-                'backgroundColor': 'rgba(255, 99, 132, 0.1)',
-                'tension': 0.4,
-                'fill': False,
-                'borderWidth': 3,
-                'yAxisID': 'y'  # Eje izquierdo
-            }
-        ]
-    }
+    if compact:
+        return encode_object(labels=labels, mensual=mensual_data, anual=anual_data)
+
+    # Formato Chart.js: estilos pre-codificados + datos
+    dataset_mensual, dataset_anual = CHART_DATASETS[freq]
+    return encode_object(
+        labels=labels,
+        datasets=b'[' + dataset_mensual.render(mensual_data) + b',' + dataset_anual.render(anual_data) + b']'
+    )
+
+def chart_payload(limit='24', freq='M', max_points=None, metodo='lttb', compact=False):
+    """
+    JSON (bytes) del gráfico IPC, en caché por parámetros y versión
+
+    Lo usan api_ipc_chart_data y los datos iniciales de IPCDetailView.
+    """
+    # La versión en la clave invalida el caché tras cada carga (JSON ya codificado)
+    return cached(
+        versioned_key(*_chart_key_parts(limit, freq, max_points, metodo, compact)),
+        lambda: _build_chart_body(get_snapshot(), limit, freq, max_points, metodo, compact),
+    )
+
+def _chart_params(request):
+    """
+    Parámetros de api_ipc_chart_data
+
+    Returns:
+        tuple: (argumentos de chart_payload, None) o (None, respuesta 400)
+    """
+    limit = request.GET.get('limit', '24')
+    freq = request.GET.get('freq', 'M').upper()
+    compact = request.GET.get('compact') in ('1', 'true')
+    metodo = request.GET.get('downsample', 'lttb')
 
-    # Guardar en caché por 5 minutos
-    cache.set(cache_key, chart_data, 300)
+    if freq not in FREQUENCIES:
+        return None, JsonResponse({'error': f'Frecuencia no soportada: {freq}', 'disponibles': FREQUENCIES}, status=400)
+    if metodo not in DOWNSAMPLERS:
+        return None, JsonResponse({'error': f'Método no soportado: {metodo}', 'disponibles': DOWNSAMPLERS}, status=400)
 
-    return JsonResponse(chart_data)
+    try:
+        max_points = int(request.GET['max_points']) if 'max_points' in request.GET else None
+        if max_points is not None and max_points < MIN_POINTS:
+            raise ValueError(max_points)
+    except ValueError:
+        return None, JsonResponse({'error': f'max_points debe ser un entero mayor o igual a {MIN_POINTS}'}, status=400)
+
+    return (limit, freq, max_points, metodo, compact), None
+
+@conditional_on_data
+def api_ipc_chart_data(request):
+    """
+    API para datos del gráfico IPC
+
+    Parámetros GET:
+        limit: Cantidad de períodos o 'all' (por defecto 24)
+        freq: 'M' mensual (por defecto), 'Q' trimestral o 'Y' anual. En
+            Q e Y la variación del período es la compuesta de sus meses y
+            la anual es la del último mes.
+        compact: '1' para enviar solo etiquetas y valores, sin estilos
+        max_points: Máximo de puntos a enviar; si la ventana tiene más se
+            reduce con 'downsample' ('lttb' por defecto o 'minmax')
+    """
+    params, error = _chart_params(request)
+    if error is not None:
+        return error
+
+    return json_bytes_response(chart_payload(*params))
+
+def summary_payload():
+    """
+    Resumen de los datos IPC (o None si no hay datos), en caché por versión
+    """
+    # Estadísticas sobre los arreglos de la copia en memoria
+    return cached(versioned_key('summary'), lambda: get_snapshot().summary())
 
-@cache_page(600)  # Cache por 10 minutos (datos más estables)
+@conditional_on_data
 def api_ipc_summary(request):
     """
     API para resumen de datos IPC
     """
-    # Verificar caché primero
-    cache_key = 'ipc_summary_data'
-    cached_summary = cache.get(cache_key)
-    if cached_summary:
-        return JsonResponse(cached_summary)
-
-    queryset = IPCData.objects.all()
+    summary = summary_payload()
 
-    if not queryset.exists():
+    if summary is None:
         return JsonResponse({'error': 'No hay datos disponibles'})
-    
-    # Calcular estadísticas
-    df = pd.DataFrame(list(queryset.values('variacion_mensual', 'variacion_anual')))
-    
-    summary = {
-        'total_records': queryset.count(),
-        'date_range': {
-            'start': queryset.last().periodo,
-            'end': queryset.first().periodo
-        },
-        'latest': {
-            'periodo': queryset.first().periodo,
-            'mensual': float(queryset.first().variacion_mensual),
-            'anual': float(queryset.first().variacion_anual)
+
+    return JsonResponse(summary)
+
+def _parse_date_range(request):
+    """
+    Parámetros from/to (fechas ISO, opcionales). Lanza ValueError si no
+    son válidos.
+    """
+    desde = date.fromisoformat(request.GET['from']) if request.GET.get('from') else None
+    hasta = date.fromisoformat(request.GET['to']) if request.GET.get('to') else None
+    return desde, hasta
+
+def _filter_date_range(queryset, desde, hasta):
+    if desde:
+        queryset = queryset.filter(fecha__gte=desde)
+    if hasta:
+        queryset = queryset.filter(fecha__lte=hasta)
+    return queryset
+
+def _encode_cursor(fecha, pk):
+    """
+    Cursor opaco con la última (fecha, id) entregada
+    """
+    raw = f"{fecha.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    """
+    Inverso de _encode_cursor. Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        fecha_str, pk = raw.split('|')
+        return date.fromisoformat(fecha_str), int(pk)
+    except Exception:
+        raise ValueError('cursor inválido')
+
+def _query_params(request):
+    """
+    Parámetros de api_ipc_query
+
+    Returns:
+        tuple: (dict de parámetros, None) o (None, respuesta 400)
+    """
+    try:
+        desde, hasta = _parse_date_range(request)
+    except ValueError:
+        return None, JsonResponse({'error': 'Fechas inválidas, usar formato YYYY-MM-DD'}, status=400)
+
+    fields = [f.strip() for f in request.GET.get('fields', ','.join(QUERY_FIELDS)).split(',') if f.strip()]
+    invalid_fields = [f for f in fields if f not in QUERY_FIELDS]
+    if invalid_fields or not fields:
+        return None, JsonResponse({'error': f'Campos inválidos: {invalid_fields}', 'disponibles': QUERY_FIELDS}, status=400)
+
+    order = request.GET.get('order', 'asc')
+    if order not in ('asc', 'desc'):
+        return None, JsonResponse({'error': "order debe ser 'asc' o 'desc'"}, status=400)
+
+    try:
+        limit = min(max(int(request.GET.get('limit', QUERY_DEFAULT_LIMIT)), 1), QUERY_MAX_LIMIT)
+    except ValueError:
+        limit = QUERY_DEFAULT_LIMIT
+
+    cursor = None
+    if request.GET.get('cursor'):
+        try:
+            cursor = _decode_cursor(request.GET['cursor'])
+        except ValueError:
+            return None, JsonResponse({'error': 'Cursor inválido'}, status=400)
+
+    return {'fields': fields, 'desde': desde, 'hasta': hasta, 'order': order, 'limit': limit, 'cursor': cursor}, None
+
+def _query_queryset(params):
+    """
+    Consulta de una página (con una fila extra para saber si hay página
+    siguiente) y sus columnas
+    """
+    queryset = _filter_date_range(IPCData.objects.all(), params['desde'], params['hasta'])
+
+    if params['cursor']:
+        cursor_fecha, cursor_pk = params['cursor']
+        # Seek: continuar justo después de la última fila entregada
+        if params['order'] == 'asc':
+            queryset = queryset.filter(Q(fecha__gt=cursor_fecha) | Q(fecha=cursor_fecha, pk__gt=cursor_pk))
+        else:
+            queryset = queryset.filter(Q(fecha__lt=cursor_fecha) | Q(fecha=cursor_fecha, pk__lt=cursor_pk))
+
+    ordering = ['fecha', 'pk'] if params['order'] == 'asc' else ['-fecha', '-pk']
+    columnas = list(dict.fromkeys(['pk', 'fecha'] + params['fields']))
+
+    return queryset.order_by(*ordering).values_list(*columnas)[:params['limit'] + 1], columnas
+
+def _rows_page(rows, columnas, params):
+    """
+    Respuesta de api_ipc_query a partir de las filas de _query_queryset
+    """
+    fields = params['fields']
+    has_next = len(rows) > params['limit']
+    rows = rows[:params['limit']]
+
+    data = {field: [] for field in fields}
+    for row in rows:
+        values = dict(zip(columnas, row))
+        for field in fields:
+            value = values[field]
+            if field == 'fecha':
+                value = value.isoformat()
+            elif field != 'periodo':
+                value = float(value)
+            data[field].append(value)
+
+    next_cursor = None
+    if has_next and rows:
+        last = dict(zip(columnas, rows[-1]))
+        next_cursor = _encode_cursor(last['fecha'], last['pk'])
+
+    return {
+        'fields': fields,
+        'count': len(rows),
+        'data': data,
+        'next': next_cursor,
+    }
+
+def _snapshot_query_page(snapshot, params):
+    """
+    Página de api_ipc_query desde la copia en memoria (backend 'parquet'),
+    con el mismo formato que la consulta a la base de datos
+    """
+    after = params['cursor'][0] if params['cursor'] else None
+    pagina, has_next = snapshot.page(
+        params['limit'], params['desde'], params['hasta'], after=after, descending=params['order'] == 'desc'
+    )
+    filas = pagina.records()
+    ids = pagina.ids.tolist()
+    if params['order'] == 'desc':
+        filas.reverse()
+        ids.reverse()
+
+    data = {
+        field: [fila[field].isoformat() if field == 'fecha' else fila[field] for fila in filas]
+        for field in params['fields']
+    }
+
+    next_cursor = None
+    if has_next and filas:
+        next_cursor = _encode_cursor(filas[-1]['fecha'], ids[-1])
+
+    return {
+        'fields': params['fields'],
+        'count': len(filas),
+        'data': data,
+        'next': next_cursor,
+    }
+
+@conditional_on_data
+def api_ipc_query(request):
+    """
+    API de consulta por rango de fechas con paginación keyset
+
+    Parámetros GET:
+        from, to: Fechas ISO (YYYY-MM-DD), ambas inclusive
+        fields: Columnas a devolver, separadas por coma
+        order: 'asc' (por defecto) o 'desc'
+        limit: Filas por página (máximo QUERY_MAX_LIMIT)
+        cursor: Valor 'next' de la página anterior
+
+    La paginación busca por (fecha, id) en lugar de usar OFFSET, así que
+    cada página cuesta lo mismo sin importar qué tan profunda sea. En el
+    backend 'parquet' la página sale de la copia en memoria.
+    """
+    params, error = _query_params(request)
+    if error is not None:
+        return error
+
+    if reads_from_parquet():
+        return JsonResponse(_snapshot_query_page(get_snapshot(), params))
+
+    queryset, columnas = _query_queryset(params)
+    return JsonResponse(_rows_page(list(queryset), columnas, params))
+
+def api_series(request, codigo):
+    """
+    Puntos de cualquier serie del catálogo (Serie + Observacion), por
+    ejemplo 'chile.ipc.variacion_mensual'
+
+    Parámetros GET:
+        limit: Últimos N puntos (por defecto 24, máximo QUERY_MAX_LIMIT)
+        from, to: Fechas ISO (YYYY-MM-DD); con alguna de ellas se
+            devuelve el rango completo en lugar de los últimos N
+
+    Ambos casos son un recorrido de rango sobre el índice (serie_id, fecha).
+    """
+    serie = Serie.objects.filter(codigo=codigo).first()
+    if serie is None:
+        return JsonResponse({'error': f'Serie no encontrada: {codigo}'}, status=404)
+
+    try:
+        desde, hasta = _parse_date_range(request)
+    except ValueError:
+        return JsonResponse({'error': 'Fechas inválidas, usar formato YYYY-MM-DD'}, status=400)
+
+    if desde or hasta:
+        puntos = list(rango(serie, desde, hasta))
+    else:
+        try:
+            limit = min(max(int(request.GET.get('limit', 24)), 1), QUERY_MAX_LIMIT)
+        except ValueError:
+            limit = 24
+        puntos = ultimos_puntos(serie, limit)
+
+    return JsonResponse({
+        'serie': {
+            'codigo': serie.codigo,
+            'nombre': serie.nombre,
+            'frecuencia': serie.frecuencia,
+            'unidad': serie.unidad,
         },
-        'statistics': {
-            'mensual': {
-                'promedio': round(df['variacion_mensual'].mean(), 2),
-                'maximo': float(df['variacion_mensual'].max()),
-                'minimo': float(df['variacion_mensual'].min())
-            },
-            'anual': {
-                'promedio': round(df['variacion_anual'].mean(), 2),
-                'maximo': float(df['variacion_anual'].max()),
-                'minimo': float(df['variacion_anual'].min())
-            }
-        }
+        'fechas': [fecha.isoformat() for fecha, _ in puntos],
+        'valores': [float(valor) for _, valor in puntos],
+    })
+
+@conditional_on_data
+def api_ipc_indicators(request):
+    """
+    Indicadores derivados de la serie IPC
+
+    Parámetros GET:
+        indicators: Lista separada por comas de rolling_mean, annualized_3m,
+            annualized_6m e index (por defecto todos)
+        window: Meses de la media móvil (por defecto 12, máximo MAX_WINDOW)
+        from, to: Fechas ISO (YYYY-MM-DD), ambas inclusive. La inflación
+            acumulada se calcula sobre este tramo.
+
+    Las series se calculan sobre el histórico completo y luego se cortan,
+    así que la media móvil del primer mes pedido usa los meses anteriores.
+    """
+    nombres = [nombre for nombre in request.GET.get('indicators', '').split(',') if nombre] or list(INDICATORS)
+    invalidos = [nombre for nombre in nombres if nombre not in INDICATORS]
+    if invalidos:
+        return JsonResponse({'error': f'Indicadores no soportados: {", ".join(invalidos)}', 'disponibles': list(INDICATORS)}, status=400)
+
+    try:
+        window = int(request.GET.get('window', DEFAULT_WINDOW))
+        if not 1 <= window <= MAX_WINDOW:
+            raise ValueError(window)
+    except ValueError:
+        return JsonResponse({'error': f'window debe ser un entero entre 1 y {MAX_WINDOW}'}, status=400)
+
+    try:
+        desde, hasta = _parse_date_range(request)
+    except ValueError:
+        return JsonResponse({'error': 'Fechas inválidas, usar formato YYYY-MM-DD'}, status=400)
+
+    snapshot = get_snapshot()
+    inicio, fin = snapshot.bounds(desde, hasta)
+
+    acumulada = cumulative_inflation(snapshot.mensual[inicio:fin])
+    cumulative = {
+        'from': snapshot.periodos[inicio] if inicio < fin else None,
+        'to': snapshot.periodos[fin - 1] if inicio < fin else None,
+        'inflation': None if acumulada is None else round(acumulada, DERIVED_DIGITS),
     }
 
-    # Guardar en caché por 10 minutos
-    cache.set(cache_key, summary, 600)
+    body = encode_object(
+        labels=encode_array(snapshot.periodos[inicio:fin]),
+        indicators=encode_object(**{
+            nombre: encode_array(derived_series(snapshot, nombre, window)[inicio:fin])
+            for nombre in nombres
+        }),
+        cumulative=dumps(cumulative),
+    )
 
-    return JsonResponse(summary)
+    return json_bytes_response(body)
 
+
+@conditional_on_data
 def api_ipc_export_excel(request):
     """
     Exportar todos los datos IPC a Excel
+
+    El archivo se genera una vez por versión de los datos al terminar la
+    carga y aquí solo se envía; si todavía no existe se genera en un
+    archivo temporal para esta request.
     """
     try:
-        # Obtener todos los datos ordenados por fecha
-        queryset = IPCData.objects.all().order_by('-fecha')
-
-        if not queryset.exists():
+        if not IPCData.objects.exists():
             return HttpResponse("No hay datos para exportar", status=404)
 
-        # Convertir a DataFrame
-        data = []
-        for record in queryset:
-            data.append({
-                'Período': record.periodo,
-                'Fecha': record.fecha.strftime('%d/%m/%Y'),
-                'Variación Mensual (%)': float(record.variacion_mensual),
-                'Variación Anual (%)': float(record.variacion_anual),
-                'Fecha Actualización': record.updated_at.strftime('%d/%m/%Y %H:%M')
-            })
-
-        df = pd.DataFrame(data)
-
-        # Crear buffer para el archivo Excel
-        output = io.BytesIO()
-
-        # Crear archivo Excel con múltiples hojas (12 meses por hoja)
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            rows_per_sheet = 12
-            total_rows = len(df)
-            sheet_number = 1
-
-            for start_idx in range(0, total_rows, rows_per_sheet):
-                end_idx = min(start_idx + rows_per_sheet, total_rows)
-                sheet_data = df.iloc[start_idx:end_idx]
-
-                # Nombre de la hoja
-                sheet_name = f'Página {sheet_number}'
-
-                # Escribir datos en la hoja
-                sheet_data.to_excel(writer, sheet_name=sheet_name, index=False)
-
-                # Obtener worksheet para formatear
-                worksheet = writer.sheets[sheet_name]
-
-                # Ajustar ancho de columnas
-                for column in worksheet.columns:
-                    max_length = 0
-                    column = [cell for cell in column]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
-
-                sheet_number += 1
-
-            # Hoja resumen
-            summary_data = {
-                'Estadística': [
-                    'Total de Registros',
-                    'Período Más Antiguo',
-                    'Período Más Reciente',
-                    'Promedio Variación Mensual',
-                    'Promedio Variación Anual',
-                    'Máxima Variación Mensual',
-                    'Mínima Variación Mensual',
-                    'Máxima Variación Anual',
-                    'Mínima Variación Anual'
-                ],
-                'Valor': [
-                    len(df),
-                    df.iloc[-1]['Período'],
-                    df.iloc[0]['Período'],
-                    f"{df['Variación Mensual (%)'].mean():.2f}%",
-                    f"{df['Variación Anual (%)'].mean():.2f}%",
-                    f"{df['Variación Mensual (%)'].max():.2f}%",
-                    f"{df['Variación Mensual (%)'].min():.2f}%",
-                    f"{df['Variación Anual (%)'].max():.2f}%",
-                    f"{df['Variación Anual (%)'].min():.2f}%"
-                ]
-            }
-
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Resumen', index=False)
-
-        output.seek(0)
-
-        # Configurar respuesta HTTP
-        response = HttpResponse(
-            output.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        output = open_artifact('xlsx')
+        if output is None:
+            # Sin archivo de la versión actual: se genera en un archivo temporal
+            output = tempfile.TemporaryFile()
+            write_ipc_workbook(output)
+            output.seek(0)
 
         # Nombre del archivo con fecha actual
         filename = f'datos_ipc_chile_{datetime.now().strftime("%Y%m%d")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
 
-        return response
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename=filename,
+            content_type=EXCEL_CONTENT_TYPE
+        )
 
     except Exception as e:
-        return HttpResponse(f"Error generando Excel: {str(e)}", status=500)
\ No newline at end of file
+        return HttpResponse(f"Error generando Excel: {str(e)}", status=500)
+
+
+@conditional_on_data
+def api_ipc_export(request):
+    """
+    Exportación para consumidores de datos en formato columnar
+
+    Parámetros GET:
+        format: 'csv' (por defecto), 'parquet' o 'arrow' (Arrow IPC stream)
+        from, to: Fechas ISO (YYYY-MM-DD), ambas inclusive
+
+    Sin filtros se envía el archivo pre-generado de la versión actual, si
+    existe. Si no, o con filtros, CSV y Arrow se envían a medida que se leen de la base de datos
+    y el Parquet se escribe por row groups a un archivo temporal (el
+    formato necesita el footer al final) y se envía con FileResponse.
+    """
+    formato = request.GET.get('format', 'csv')
+    if formato not in EXPORT_CONTENT_TYPES:
+        return JsonResponse({'error': f'Formato no soportado: {formato}', 'disponibles': list(EXPORT_CONTENT_TYPES)}, status=400)
+
+    try:
+        desde, hasta = _parse_date_range(request)
+    except ValueError:
+        return JsonResponse({'error': 'Fechas inválidas, usar formato YYYY-MM-DD'}, status=400)
+
+    queryset = _filter_date_range(IPCData.objects.all(), desde, hasta)
+    filename = f'datos_ipc_chile_{datetime.now().strftime("%Y%m%d")}.{EXPORT_EXTENSIONS[formato]}'
+    content_type = EXPORT_CONTENT_TYPES[formato]
+
+    # Export completo: archivo pre-generado de la versión actual
+    output = open_artifact(formato) if desde is None and hasta is None else None
+    if output is not None:
+        return FileResponse(output, as_attachment=True, filename=filename, content_type=content_type)
+
+    if formato == 'parquet':
+        output = tempfile.TemporaryFile()
+        write_parquet(output, queryset)
+        output.seek(0)
+        return FileResponse(output, as_attachment=True, filename=filename, content_type=content_type)
+
+    stream = stream_csv(queryset) if formato == 'csv' else stream_arrow(queryset)
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Vistas async para ASGI: mismas respuestas que api_ipc_chart_data,
+# api_ipc_summary y api_ipc_query, con la caché y el ORM async. Las
+# requests concurrentes con la misma clave comparten una sola lectura.
+
+async def achart_payload(limit='24', freq='M', max_points=None, metodo='lttb', compact=False):
+    """
+    Versión async de chart_payload
+    """
+    async def calcular():
+        return _build_chart_body(await aget_snapshot(), limit, freq, max_points, metodo, compact)
+
+    return await acached(await aversioned_key(*_chart_key_parts(limit, freq, max_points, metodo, compact)), calcular)
+
+@aconditional_on_data
+async def api_ipc_chart_data_async(request):
+    """
+    Versión async de api_ipc_chart_data (mismos parámetros)
+    """
+    params, error = _chart_params(request)
+    if error is not None:
+        return error
+
+    return json_bytes_response(await achart_payload(*params))
+
+async def asummary_payload():
+    """
+    Versión async de summary_payload
+    """
+    async def calcular():
+        return (await aget_snapshot()).summary()
+
+    return await acached(await aversioned_key('summary'), calcular)
+
+@aconditional_on_data
+async def api_ipc_summary_async(request):
+    """
+    Versión async de api_ipc_summary
+    """
+    summary = await asummary_payload()
+
+    if summary is None:
+        return JsonResponse({'error': 'No hay datos disponibles'})
+
+    return JsonResponse(summary)
+
+@aconditional_on_data
+async def api_ipc_query_async(request):
+    """
+    Versión async de api_ipc_query (mismos parámetros)
+    """
+    params, error = _query_params(request)
+    if error is not None:
+        return error
+
+    if reads_from_parquet():
+        return JsonResponse(_snapshot_query_page(await aget_snapshot(), params))
+
+    async def leer():
+        queryset, columnas = _query_queryset(params)
+        return _rows_page([row async for row in queryset], columnas, params)
+
+    # Misma página pedida a la vez: una sola consulta
+    clave = (
+        await aversioned_key('query'), tuple(params['fields']), params['desde'], params['hasta'],
+        params['order'], params['limit'], params['cursor'],
+    )
+    return JsonResponse(await coalesced(clave, leer))
+